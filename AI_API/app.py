@@ -8,12 +8,13 @@ import json
 import pandas as pd
 from openai.types import FunctionDefinition  # Using OpenAI SDK's FunctionDefinition
 from pandas_operations import load_csv, list_columns, summarize_top_rows, delete_column
-from pandas_operations import describe_data, plot_covariance_heatmap, plot_feature_boxplots, get_dataframe_sample, upload_and_load_csv
+from pandas_operations import get_dataframe_sample
+from pandas_operations import describe_data_stream, plot_covariance_heatmap_stream, plot_feature_boxplots_stream, upload_and_load_csv_stream
 
 
 # Call OpenAI API with function support
 def call_openai_with_functions(user_input, file, api_key):
-    """ Call OpenAI API with function support """
+    """ Call OpenAI API with function support, yielding (response, plot, table) updates """
     client = openai.OpenAI(api_key=api_key)
 
     pd_functions = [
@@ -64,6 +65,9 @@ def call_openai_with_functions(user_input, file, api_key):
         }
     ]
 
+    # Let the user know something is happening while the model decides
+    yield "Thinking...", None, None
+
     response = client.chat.completions.create(
         model="gpt-4o-mini",
         messages=[{"role": "user", "content": user_input}],
@@ -78,25 +82,30 @@ def call_openai_with_functions(user_input, file, api_key):
         arguments = json.loads(message.function_call.arguments)
         # return message # test code, test the response when you call a functions.
         if function_name == "load_local_csv":
-            return load_csv(arguments["file_path"]), None, None
+            yield load_csv(arguments["file_path"]), None, None
+            return
         elif function_name == "list_columns":
-            return list_columns(), None, None
+            yield list_columns(), None, None
+            return
         elif function_name == "summarize_top_rows":
-            return summarize_top_rows(), None, None
+            yield summarize_top_rows(), None, None
+            return
         elif function_name == "delete_column":
-            return delete_column(arguments["column_name"]), None, None
+            yield delete_column(arguments["column_name"]), None, None
+            return
         elif function_name == "describe_data":
-            describe_content,desc_result, df_table = describe_data()
-            if df_table is not None:
-                return describe_content, None, df_table  
-            else:
-                return describe_content, None, None
+            # a preview table arrives first, the full statistics replace it
+            for describe_content, desc_result, df_table in describe_data_stream():
+                yield describe_content, None, df_table
+            return
         elif function_name == "plot_covariance_heatmap":
-            message,image_path = plot_covariance_heatmap()
-            return message, image_path, None   
+            for message, image_path in plot_covariance_heatmap_stream():
+                yield message, image_path, None
+            return
         elif function_name == "plot_feature_boxplots":
-            message,image_path = plot_feature_boxplots()
-            return message, image_path, None        
+            for message, image_path in plot_feature_boxplots_stream():
+                yield message, image_path, None
+            return
         elif function_name == "get_dataframe_advice":
             sample_json = get_dataframe_sample(arguments.get("n", 5), arguments.get("max_cols", 5))
             
@@ -108,28 +117,40 @@ def call_openai_with_functions(user_input, file, api_key):
             Provide responses in pure text.
             """
 
-            response = client.chat.completions.create(
+            # stream the advice so the text appears as it is generated
+            stream = client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[{"role": "user", "content": prompt}],
-                temperature=0.7
+                temperature=0.7,
+                stream=True
             )
 
-            return response.choices[0].message.content, None, None
+            advice = ""
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    advice += chunk.choices[0].delta.content
+                    yield advice, None, None
+            return
         elif function_name == "load_s3_csv_from_aws" and file is not None:
             file_path = file.name
             s3_key = os.path.basename(file_path)
-            return upload_and_load_csv(file_path, s3_key), None, None
+            for progress in upload_and_load_csv_stream(file_path, s3_key):
+                yield progress, None, None
+            return
 
-    return message.content, None, None  # Return AI's normal response
+    yield message.content, None, None  # Return AI's normal response
 
 # Gradio interface
 def chatbot_ui(user_input, file=None, api_key=os.getenv("OPENAI_API_KEY")):
+    """ Yield (response, plot, table) updates so Gradio can show progress as it arrives """
     print(user_input)
     if file is not None and user_input == '\n':
         file_path = file.name
         s3_key = os.path.basename(file_path)
-        return upload_and_load_csv(file_path, s3_key), None, None
-    return call_openai_with_functions(user_input, file ,api_key=os.getenv("OPENAI_API_KEY"))
+        for progress in upload_and_load_csv_stream(file_path, s3_key):
+            yield progress, None, None
+        return
+    yield from call_openai_with_functions(user_input, file ,api_key=os.getenv("OPENAI_API_KEY"))
 
 # Create a Gradio interface
 iface = gr.Interface(
@@ -149,4 +170,6 @@ iface = gr.Interface(
 )
 
 
+# queue() lets the generator above push each intermediate update to the browser
+iface.queue()
 iface.launch(server_name="0.0.0.0", server_port=7860)
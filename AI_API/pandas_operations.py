@@ -2,16 +2,21 @@ import pandas as pd
 import os
 import dotenv
 import json
+import threading
 import matplotlib.pyplot as plt
 import seaborn as sns
 import boto3
 from io import StringIO
 from botocore.exceptions import NoCredentialsError
+from covariance_engine import CovarianceEngine
 
 dotenv.load_dotenv()
 # Store the current DataFrame
 dataframe = None
 file_path_global = None
+# Bumped whenever `dataframe` changes so cached results know when they are stale
+dataframe_version = 0
+covariance_engine = CovarianceEngine()
 
 current_directory = os.getcwd()
 current_directory = os.path.join(current_directory, "images")
@@ -23,6 +28,16 @@ AWS_REGION = os.getenv("AWS_REGION")
 S3_BUCKET = os.getenv("S3_BUCKET_NAME")
 S3_KEY=None
 
+# Rows per parsed chunk and bytes per downloaded chunk when streaming a CSV
+CHUNK_ROWS = 50000
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+# Seconds between progress messages while an upload runs in the background
+PROGRESS_INTERVAL = 0.5
+# Rows shown before full statistics, and rows/resolution used for draft plots
+PREVIEW_ROWS = 10
+DRAFT_ROWS = 5000
+DRAFT_DPI = 72
+
 
 s3_client = boto3.client(
     "s3",
@@ -31,6 +46,12 @@ s3_client = boto3.client(
     region_name=AWS_REGION
 )
 
+def _bump_version():
+    """ Mark the loaded dataset as changed and return its new version """
+    global dataframe_version
+    dataframe_version += 1
+    return dataframe_version
+
 def load_csv_from_s3(s3_key):
     """ Load a CSV file from an S3 bucket """
     global dataframe
@@ -49,6 +70,7 @@ def load_csv_from_s3(s3_key):
             dataframe = pd.read_csv(StringIO(data), sep=";")  
 
         dataframe = dataframe.apply(pd.to_numeric, errors="coerce")
+        _bump_version()
 
         # keep track of the file path
         file_path_global = f"s3://{S3_BUCKET}/{s3_key}"
@@ -58,6 +80,58 @@ def load_csv_from_s3(s3_key):
     except Exception as e:
         return f"Error loading file from S3: {str(e)}"
 
+def _read_csv_chunks(data):
+    """ Parse CSV text chunk by chunk, yielding the chunks as they are read """
+    # when the file is separated by `;`
+    header = data[:data.find("\n")] if "\n" in data else data
+    sep = ";" if ";" in header.split(",")[0] else ","
+    for chunk in pd.read_csv(StringIO(data), sep=sep, chunksize=CHUNK_ROWS):
+        yield chunk
+
+
+def load_csv_from_s3_stream(s3_key):
+    """ Load a CSV file from an S3 bucket, yielding download and parse progress """
+    global dataframe
+    global file_path_global
+
+    try:
+        obj = s3_client.get_object(Bucket=S3_BUCKET, Key=s3_key)
+        total = obj.get("ContentLength") or 0
+        body = obj["Body"]
+
+        # download the object in pieces so the user sees it arrive
+        parts = []
+        received = 0
+        while True:
+            part = body.read(DOWNLOAD_CHUNK_BYTES)
+            if not part:
+                break
+            parts.append(part)
+            received += len(part)
+            if total:
+                yield f"Downloading '{s3_key}' from S3... {received * 100 // total}%"
+        data = b"".join(parts).decode("utf-8")
+
+        # parse in chunks and report the row count as it grows
+        chunks = []
+        rows = 0
+        for chunk in _read_csv_chunks(data):
+            chunks.append(chunk)
+            rows += len(chunk)
+            yield f"Parsing '{s3_key}'... {rows} rows read"
+
+        frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+        dataframe = frame.apply(pd.to_numeric, errors="coerce")
+        _bump_version()
+
+        # keep track of the file path
+        file_path_global = f"s3://{S3_BUCKET}/{s3_key}"
+
+        yield f"File '{s3_key}' loaded successfully from S3! ({rows} rows)"
+
+    except Exception as e:
+        yield f"Error loading file from S3: {str(e)}"
+
 def delete_s3_file():
     """ Delete a file from an S3 bucket """
     try:
@@ -66,7 +140,7 @@ def delete_s3_file():
     except Exception as e:
         return f"Error deleting file from S3: {str(e)}"
 
-def upload_csv_to_s3(file_path, bucket_name, s3_key):
+def upload_csv_to_s3(file_path, bucket_name, s3_key, callback=None):
     """ Upload a file to an S3 bucket"""
     s3 = boto3.client(
         "s3",
@@ -76,7 +150,7 @@ def upload_csv_to_s3(file_path, bucket_name, s3_key):
     )
 
     try:
-        s3.upload_file(file_path, bucket_name, s3_key)
+        s3.upload_file(file_path, bucket_name, s3_key, Callback=callback)
         file_url = f"https://{bucket_name}.s3.{os.getenv('AWS_REGION')}.amazonaws.com/{s3_key}"
         return f"File uploaded successfully: [Download link]({file_url})"
     except NoCredentialsError:
@@ -98,6 +172,42 @@ def upload_and_load_csv(file_path, s3_key):
     return upload_msg
 
 
+def upload_csv_to_s3_stream(file_path, bucket_name, s3_key):
+    """ Upload a file to an S3 bucket, yielding progress until the upload finishes """
+    total = os.path.getsize(file_path)
+    sent = [0]
+    result = []
+
+    def on_progress(n_bytes):
+        sent[0] += n_bytes
+
+    # boto3 blocks until the transfer completes, so run it beside the generator
+    worker = threading.Thread(
+        target=lambda: result.append(upload_csv_to_s3(file_path, bucket_name, s3_key, callback=on_progress))
+    )
+    worker.start()
+    while worker.is_alive():
+        worker.join(PROGRESS_INTERVAL)
+        if worker.is_alive() and total:
+            yield f"Uploading '{s3_key}' to S3... {min(sent[0], total) * 100 // total}%"
+
+    yield result[0]
+
+
+def upload_and_load_csv_stream(file_path, s3_key):
+    """ Upload a CSV file to S3 and load it, yielding progress messages """
+    global S3_KEY
+    if S3_KEY is not None:
+        delete_s3_file()
+    S3_KEY = s3_key
+    bucket_name = os.getenv("S3_BUCKET_NAME")
+    upload_msg = None
+    for upload_msg in upload_csv_to_s3_stream(file_path, bucket_name, s3_key):
+        yield upload_msg
+    if "successfully" in upload_msg:
+        yield from load_csv_from_s3_stream(s3_key)
+
+
 def load_csv(file_path):
     """ Load a CSV file """
     global dataframe
@@ -112,6 +222,7 @@ def load_csv(file_path):
             dataframe[col] = pd.to_numeric(dataframe[col], errors="coerce")  
         
         dataframe = dataframe.apply(pd.to_numeric, errors="coerce")
+        _bump_version()
 
     file_path_global = file_path
 
@@ -136,6 +247,11 @@ def delete_column(column_name):
     if dataframe is not None:
         if column_name in dataframe.columns:
             dataframe.drop(columns=[column_name], inplace=True)
+            previous_version = dataframe_version
+            version = _bump_version()
+            # shrink the cached covariance instead of recomputing it later
+            if covariance_engine.version == previous_version:
+                covariance_engine.drop_columns([column_name], version=version)
             return f"Column '{column_name}' has been deleted."
         return f"Column '{column_name}' does not exist!"
     return "Please load the data file first!"
@@ -159,30 +275,78 @@ def describe_data():
     return  "Done!",formatted_output, df_table
 
 
+def describe_data_stream():
+    """ Yield a preview of the first rows, then the full description of the dataset """
+    if dataframe is None or dataframe.empty:
+        yield "No data loaded. Please load a CSV file first.", None, None
+        return
+
+    preview = dataframe.head(PREVIEW_ROWS).reset_index()
+    yield f"Preview of {len(dataframe)} rows, computing statistics...", None, preview
+
+    yield describe_data()
+
+
+def _save_covariance_heatmap(covariance_matrix, save_path, dpi=300, annot=True):
+    """ Draw a covariance matrix as a heatmap and save it to `save_path` """
+    # Create the plot
+    plt.figure(figsize=(10, 8))
+    sns.heatmap(covariance_matrix, annot=annot, fmt=".2f", cmap="coolwarm", linewidths=0.5)
+    plt.title("Covariance Matrix Heatmap")
+
+    # Save the plot
+    plt.savefig(save_path, dpi=dpi, bbox_inches="tight")
+    plt.close()
+
+
+def _save_feature_boxplots(numeric_df, save_path, dpi=300):
+    """ Draw box plots for the columns of `numeric_df` and save them to `save_path` """
+    plt.figure(figsize=(12, 6)) 
+    sns.boxplot(data=numeric_df)
+    plt.xticks(rotation=45)  # rotate x-axis labels for better visibility
+    plt.title("Feature Box Plots")
+
+    plt.savefig(save_path, dpi=dpi, bbox_inches="tight")
+    plt.close()
+
+
 def plot_covariance_heatmap(output_dir=current_directory, filename="covariance_heatmap.png"):
     """ Save a heatmap of the covariance matrix to an images folder """
     if dataframe is not None:
         # Create the output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
         
-        # Compute the covariance matrix
-        covariance_matrix = dataframe.cov()
-
-        # Create the plot
-        plt.figure(figsize=(10, 8))
-        sns.heatmap(covariance_matrix, annot=True, fmt=".2f", cmap="coolwarm", linewidths=0.5)
-        plt.title("Covariance Matrix Heatmap")
-        
-        # Save the plot
         save_path = os.path.join(output_dir, filename)
         print("-------",save_path)
-        plt.savefig(save_path, dpi=300, bbox_inches="tight")
-        plt.close()
+        # Compute the covariance matrix, reusing the cached one when the data is unchanged
+        covariance_matrix = covariance_engine.covariance(dataframe, version=dataframe_version)
+        _save_covariance_heatmap(covariance_matrix, save_path)
         
         return "Covariance Heatmap done!", save_path
     return "Please load the data file first!", None
 
 
+def plot_covariance_heatmap_stream(output_dir=current_directory, filename="covariance_heatmap.png"):
+    """ Yield a quick draft of the covariance heatmap from a row sample, then the final plot """
+    if dataframe is None:
+        yield "Please load the data file first!", None
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    # a draft only helps when the full matrix still has to be computed
+    cached = covariance_engine.counts is not None and covariance_engine.version == dataframe_version
+    if len(dataframe) > DRAFT_ROWS and not cached:
+        draft_path = os.path.join(output_dir, "draft_" + filename)
+        _save_covariance_heatmap(dataframe.head(DRAFT_ROWS).cov(), draft_path, dpi=DRAFT_DPI, annot=False)
+        yield f"Draft heatmap from the first {DRAFT_ROWS} rows, computing the full matrix...", draft_path
+
+    save_path = os.path.join(output_dir, filename)
+    covariance_matrix = covariance_engine.covariance(dataframe, version=dataframe_version)
+    _save_covariance_heatmap(covariance_matrix, save_path)
+    yield "Covariance Heatmap done!", save_path
+
+
 def plot_feature_boxplots(output_dir=current_directory, filename="feature_boxplots.png"):
     """ Generate box plots for all numerical features and save the figure """
     
@@ -195,20 +359,37 @@ def plot_feature_boxplots(output_dir=current_directory, filename="feature_boxplo
         
         os.makedirs(output_dir, exist_ok=True)
 
-        plt.figure(figsize=(12, 6)) 
-        sns.boxplot(data=numeric_df)
-        plt.xticks(rotation=45)  # rotate x-axis labels for better visibility
-        plt.title("Feature Box Plots")
-
         save_path = os.path.join(output_dir, filename)
-        plt.savefig(save_path, dpi=300, bbox_inches="tight")
-        plt.close()
+        _save_feature_boxplots(numeric_df, save_path)
 
         return "boxplots done!", save_path
 
     return "Error: No data loaded. Please load a CSV file first.", None
 
 
+def plot_feature_boxplots_stream(output_dir=current_directory, filename="feature_boxplots.png"):
+    """ Yield draft box plots from a row sample, then the final figure """
+    if dataframe is None:
+        yield "Error: No data loaded. Please load a CSV file first.", None
+        return
+
+    numeric_df = dataframe.select_dtypes(include=["number"])
+    if numeric_df.empty:
+        yield "Error: No numeric features available for box plot!", None
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    if len(numeric_df) > DRAFT_ROWS:
+        draft_path = os.path.join(output_dir, "draft_" + filename)
+        _save_feature_boxplots(numeric_df.head(DRAFT_ROWS), draft_path, dpi=DRAFT_DPI)
+        yield f"Draft box plots from the first {DRAFT_ROWS} rows, plotting all rows...", draft_path
+
+    save_path = os.path.join(output_dir, filename)
+    _save_feature_boxplots(numeric_df, save_path)
+    yield "boxplots done!", save_path
+
+
 def get_dataframe_sample(n=5, max_cols=5):
     """ Return a small sample of the dataframe to be included in OpenAI input """
     
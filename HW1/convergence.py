@@ -0,0 +1,238 @@
+import hashlib
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from problems import PROBLEMS, scalar_rhs
+from rk_ensemble import TABLEAUS, solve_ensemble
+
+###############################################################################
+# Convergence studies for the fixed-step integrators (RK4_and_RK5_ODE.ipynb).
+#
+# A study is (problem, methods, step sizes). Every (method, h) run is an
+# independent task fanned out over a process pool. Results are cached on
+# disk so nothing is recomputed when a study is re-run or extended:
+#   - reference solutions (DOP853 with dense output), keyed by problem,
+#     parameters, interval, initial condition and tolerances,
+#   - the error of every (method, h) run, keyed by the same plus method and h.
+# Adding a problem, method or step size only computes the missing pieces.
+###############################################################################
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".convergence_cache")
+REFERENCE_TOL = 1e-12
+
+# Step sizes used in the notebook for each problem
+DEFAULT_STEP_SIZES = {
+    "vanderpol": [0.05, 0.025, 0.0125, 0.00625, 0.003125, 0.0015625],
+    "lotka_volterra": [0.5, 0.25, 0.125, 0.0625, 0.03125],
+    "brusselator": [0.1, 0.05, 0.025, 0.0125, 0.00625],
+}
+
+
+def consecutive_rates(errors, hs):
+    """ Observed order between neighbouring step sizes: log(e_{i+1}/e_i) / log(h_{i+1}/h_i) """
+    rates = []
+    for i in range(len(errors) - 1):
+        ratio_e = errors[i + 1] / errors[i]
+        ratio_h = hs[i + 1] / hs[i]
+        rates.append(float(np.log(ratio_e) / np.log(ratio_h)))
+    return rates
+
+
+def _cache_key(**fields):
+    """ Stable short hash of JSON-serializable fields """
+    text = json.dumps(fields, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:20]
+
+
+def _problem_setup(spec):
+    """ Fill in the notebook defaults for anything the study spec leaves out """
+    problem = PROBLEMS[spec["problem"]]
+    params = {**problem["params"], **(spec.get("params") or {})}
+    return {
+        "problem": spec["problem"],
+        "params": params,
+        "t_span": list(spec.get("t_span") or problem["t_span"]),
+        "y0": list(spec.get("y0") or problem["y0"]),
+    }
+
+
+def _reference_path(setup, cache_dir, rtol, atol):
+    key = _cache_key(kind="reference", rtol=rtol, atol=atol, **setup)
+    return os.path.join(cache_dir, f"reference_{setup['problem']}_{key}.pkl")
+
+
+def _run_path(setup, method, h, reference_path, cache_dir):
+    key = _cache_key(kind="run", method=method, h=h, reference=os.path.basename(reference_path), **setup)
+    return os.path.join(cache_dir, f"run_{setup['problem']}_{method}_{key}.json")
+
+
+def _write_atomic(path, data, mode):
+    """ Write to a temporary file and rename, so parallel workers never see partial files """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, mode) as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def compute_reference(setup, path, rtol, atol):
+    """ Solve the problem with tight-tolerance DOP853 and pickle the dense solution to `path` """
+    rhs = scalar_rhs(PROBLEMS[setup["problem"]]["rhs"], *setup["params"].values())
+    ref_sol = solve_ivp(
+        fun=rhs,
+        t_span=tuple(setup["t_span"]),
+        y0=setup["y0"],
+        method="DOP853",
+        rtol=rtol,
+        atol=atol,
+        dense_output=True,
+    )
+    _write_atomic(path, pickle.dumps(ref_sol.sol), "wb")
+    return path
+
+
+def compute_run(setup, method, h, reference_path, path):
+    """ Integrate with one (method, h), measure max |y - y_ref| on the grid and cache it """
+    rhs = PROBLEMS[setup["problem"]]["rhs"]
+    t_vals, y_vals = solve_ensemble(method, rhs, tuple(setup["t_span"]), setup["y0"], h,
+                                    args=tuple(setup["params"].values()))
+    with open(reference_path, "rb") as f:
+        reference = pickle.load(f)
+    error = float(np.max(np.abs(y_vals.T - reference(t_vals))))
+    _write_atomic(path, json.dumps({"method": method, "h": h, "error": error}), "w")
+    return path
+
+
+def run_studies(specs, cache_dir=CACHE_DIR, max_workers=None,
+                reference_rtol=REFERENCE_TOL, reference_atol=REFERENCE_TOL):
+    """
+    Run several convergence studies, sharing one process pool and the disk cache.
+
+    Args:
+        specs: List of study dicts with keys
+            problem     name in problems.PROBLEMS
+            methods     list of method names, e.g. ["RK4", "RK5"]
+            step_sizes  list of h (defaults to the notebook's for the problem)
+            params, t_span, y0  optional overrides of the notebook setup
+        cache_dir: Directory holding cached references and run errors.
+        max_workers: Process pool size; None uses os.cpu_count().
+
+    Returns:
+        A list with one study result per spec:
+        {
+            "problem": ..., "params": {...}, "t_span": [...], "y0": [...],
+            "methods": {
+                "RK4": {"step_sizes": [...], "errors": [...],
+                        "consecutive_rates": [...], "slope": 3.98},
+                ...
+            }
+        }
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    studies = []
+    for spec in specs:
+        for method in spec["methods"]:
+            if method not in TABLEAUS:
+                raise ValueError(f"Unknown method '{method}', expected one of {sorted(TABLEAUS)}")
+        setup = _problem_setup(spec)
+        step_sizes = list(spec.get("step_sizes") or DEFAULT_STEP_SIZES[spec["problem"]])
+        reference_path = _reference_path(setup, cache_dir, reference_rtol, reference_atol)
+        runs = {(method, h): _run_path(setup, method, h, reference_path, cache_dir)
+                for method in spec["methods"] for h in step_sizes}
+        studies.append((spec, setup, step_sizes, reference_path, runs))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        # 1) missing reference solutions, one per distinct setup
+        pending = {}
+        for _, setup, _, reference_path, _ in studies:
+            if not os.path.exists(reference_path) and reference_path not in pending:
+                pending[reference_path] = pool.submit(compute_reference, setup, reference_path,
+                                                      reference_rtol, reference_atol)
+        for future in pending.values():
+            future.result()
+
+        # 2) missing (method, h) runs
+        pending = {}
+        for _, setup, _, reference_path, runs in studies:
+            for (method, h), path in runs.items():
+                if not os.path.exists(path) and path not in pending:
+                    pending[path] = pool.submit(compute_run, setup, method, h, reference_path, path)
+        for future in pending.values():
+            future.result()
+
+    results = []
+    for spec, setup, step_sizes, _, runs in studies:
+        methods = {}
+        for method in spec["methods"]:
+            errors = []
+            for h in step_sizes:
+                with open(runs[(method, h)]) as f:
+                    errors.append(json.load(f)["error"])
+            slope, _ = np.polyfit(np.log(step_sizes), np.log(errors), 1)
+            methods[method] = {
+                "step_sizes": step_sizes,
+                "errors": errors,
+                "consecutive_rates": consecutive_rates(errors, step_sizes),
+                "slope": float(slope),
+            }
+        results.append({**setup, "methods": methods})
+    return results
+
+
+def run_study(problem, methods, step_sizes=None, **kwargs):
+    """ Run a single convergence study; see `run_studies` for the options and result layout """
+    spec = {"problem": problem, "methods": methods, "step_sizes": step_sizes}
+    for key in ("params", "t_span", "y0"):
+        if key in kwargs:
+            spec[key] = kwargs.pop(key)
+    return run_studies([spec], **kwargs)[0]
+
+
+def format_table(study):
+    """ The notebook's error / local order table for one study result """
+    names = list(study["methods"])
+    step_sizes = study["methods"][names[0]]["step_sizes"]
+    lines = [f"{study['problem']} {study['params']}, t in {tuple(study['t_span'])}"]
+    header = f"{'h':<10}" + "".join(f"  {name + ' Error':<14}{'Local Ord.':<10}" for name in names)
+    lines += ["-" * len(header), header, "-" * len(header)]
+    for i, h in enumerate(step_sizes):
+        row = f"{h:<10.5g}"
+        for name in names:
+            data = study["methods"][name]
+            order = f"{data['consecutive_rates'][i - 1]:.3f}" if i > 0 else "---"
+            row += f"  {data['errors'][i]:<14.6g}{order:<10}"
+        lines.append(row)
+    lines.append("-" * len(header))
+    for name in names:
+        lines.append(f"Overall log-log slope for {name} ~ {study['methods'][name]['slope']:.3f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Error vs. step size for the fixed-step RK methods")
+    parser.add_argument("--problems", nargs="+", default=list(DEFAULT_STEP_SIZES), choices=list(PROBLEMS))
+    parser.add_argument("--methods", nargs="+", default=["RK4", "RK5"], choices=list(TABLEAUS))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--json", help="write the structured results to this file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_studies([{"problem": name, "methods": args.methods} for name in args.problems],
+                          cache_dir=args.cache_dir, max_workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    for study in results:
+        print(format_table(study))
+        print()
+    print(f"Finished in {elapsed:.2f} s (cache: {args.cache_dir})")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
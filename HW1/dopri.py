@@ -0,0 +1,284 @@
+import numpy as np
+
+###############################################################################
+# Adaptive Dormand–Prince 5(4) with FSAL, PI step control and dense output.
+#
+# This is rk5_step_adaptive / rk5_solver_adaptive from RK4_and_RK5_ODE.ipynb
+# made production-ready:
+#   - First Same As Last: the last stage f(t+h, y_new) of an accepted step is
+#     the first stage of the next one, so a step costs 6 RHS evaluations, not 7,
+#     and a rejected step reuses k1 instead of recomputing it.
+#   - The 4th-order weights include the 7th stage (b7* = 1/40), which the
+#     notebook version left out; the error estimate is b - b* over all 7 stages.
+#   - A PI controller (Gustafsson) replaces the plain error-ratio update, which
+#     damps the step-size oscillations after rejections.
+#   - Dense output: the standard 4th-order continuous extension gives y(t) at
+#     any t inside a step from the stored stages, with no extra RHS calls.
+#
+# The RHS has the notebook signature f(t, y) -> dy/dt for y of shape (dim,).
+###############################################################################
+
+# Dormand–Prince coefficients
+C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1, 1])
+A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+# 5th-order weights (the same as the last row of A, which is what makes FSAL work)
+B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+# b - b*, where b* are the embedded 4th-order weights including b7* = 1/40
+E = np.array([71/57600, 0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40])
+# Continuous extension: y(t + theta*h) = y + h * K.T @ (P @ [theta, theta^2, theta^3, theta^4])
+P = np.array([
+    [1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0, 40617522/29380423, -110615467/29380423, 69997945/29380423],
+])
+
+# Step-size control
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 10.0
+PI_BETA = 0.04                # weight of the previous error (Hairer & Wanner use 0.04 for DOPRI5)
+PI_ALPHA = 1/5 - 0.75 * PI_BETA
+
+
+def dopri5_step(f, t, y, h, k1, K):
+    """
+    One Dormand–Prince step that reuses k1 = f(t, y) from the previous step.
+
+    Args:
+        K: Preallocated (7, dim) stage array; filled in place, K[6] is f(t+h, y_new).
+
+    Returns:
+        y_new: 5th-order solution at t + h.
+        y_err: Local error estimate y_5th - y_4th.
+    """
+    K[0] = k1
+    for i in range(1, 6):
+        dy = np.dot(A[i], K[:i]) * h
+        K[i] = f(t + C[i] * h, y + dy)
+    y_new = y + h * np.dot(B[:6], K[:6])
+    K[6] = f(t + h, y_new)
+    y_err = h * np.dot(E, K)
+    return y_new, y_err
+
+
+def error_norm(y_err, y, y_new, rtol, atol):
+    """ RMS norm of the error scaled by atol + rtol*max(|y|, |y_new|) """
+    scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+    return np.sqrt(np.mean((y_err / scale) ** 2))
+
+
+def initial_step(f, t0, y0, f0, rtol, atol):
+    """ Starting step size from Hairer, Nørsett & Wanner (II.4); costs one RHS call """
+    scale = atol + rtol * np.abs(y0)
+    d0 = np.sqrt(np.mean((y0 / scale) ** 2))
+    d1 = np.sqrt(np.mean((f0 / scale) ** 2))
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+
+    f1 = f(t0 + h0, y0 + h0 * f0)
+    d2 = np.sqrt(np.mean(((f1 - f0) / scale) ** 2)) / h0
+    if max(d1, d2) <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1/5)
+    return min(100 * h0, h1)
+
+
+class DenseOutput:
+    """
+    Piecewise quartic interpolant over all accepted steps.
+    Call it with a scalar or an array of times inside the integration interval.
+    """
+
+    def __init__(self, t_nodes, y_nodes, h_steps, Q):
+        self.t_nodes = t_nodes        # (n_steps + 1,) step boundaries
+        self.y_nodes = y_nodes        # (n_steps + 1, dim) states at the boundaries
+        self.h_steps = h_steps        # (n_steps,)
+        self.Q = Q                    # (n_steps, dim, 4) = K.T @ P per step
+
+    def __call__(self, t):
+        t = np.asarray(t, dtype=float)
+        scalar = t.ndim == 0
+        t = np.atleast_1d(t)
+        idx = np.clip(np.searchsorted(self.t_nodes, t, side="right") - 1, 0, len(self.h_steps) - 1)
+        h = self.h_steps[idx]
+        theta = (t - self.t_nodes[idx]) / h
+        powers = np.stack([theta, theta**2, theta**3, theta**4], axis=1)          # (n, 4)
+        y = self.y_nodes[idx] + h[:, None] * np.einsum("nij,nj->ni", self.Q[idx], powers)
+        # same layout as solve_ivp's sol(t): (dim,) for a scalar t, (dim, n) otherwise
+        return y[0] if scalar else y.T
+
+
+class DopriResult:
+    """ Solution and statistics returned by `dopri5_solver` """
+
+    def __init__(self, t, y, sol, nfev, n_accepted, n_rejected, status=0, message="Success"):
+        self.t = t
+        self.y = y
+        self.sol = sol
+        self.nfev = nfev
+        self.n_accepted = n_accepted
+        self.n_rejected = n_rejected
+        self.status = status      # 0: reached t_end, -1: integration step failed (as in solve_ivp)
+        self.message = message
+
+    @property
+    def success(self):
+        return self.status == 0
+
+    @property
+    def rejection_rate(self):
+        attempts = self.n_accepted + self.n_rejected
+        return self.n_rejected / attempts if attempts else 0.0
+
+    @property
+    def nfev_per_step(self):
+        return self.nfev / self.n_accepted if self.n_accepted else float("nan")
+
+    def __repr__(self):
+        return (f"DopriResult(status={self.status}, steps={self.n_accepted}, rejected={self.n_rejected}, "
+                f"nfev={self.nfev}, nfev/step={self.nfev_per_step:.2f})")
+
+
+def dopri5_solver(f, t_span, y0, rtol=1e-6, atol=1e-9, h0=None, max_step=np.inf,
+                  dense_output=False, t_eval=None):
+    """
+    Solve y' = f(t, y) with adaptive Dormand–Prince 5(4).
+
+    Args:
+        f: RHS f(t, y) -> dy/dt.
+        t_span: (t0, t_end) with t_end > t0.
+        y0: Initial state.
+        rtol, atol: Relative and absolute tolerances.
+        h0: Initial step; chosen automatically when None.
+        max_step: Upper bound on the step size.
+        dense_output: Build `result.sol`, a callable interpolant.
+        t_eval: Optional times to report instead of the accepted step points;
+            these are filled from the dense output, not by shortening steps.
+
+    Returns:
+        DopriResult with t, y (shape (len(t), dim)), sol, nfev, n_accepted,
+        n_rejected, status and message. If the step size falls below
+        10 * np.spacing(t) (e.g. the solution blows up), integration stops with
+        status -1 and the result covers the interval that was reached.
+    """
+    t0, t_end = t_span
+    y = np.array(y0, dtype=float)
+    K = np.empty((7, y.size))
+
+    k1 = f(t0, y)
+    nfev = 1
+    if h0 is None:
+        h0 = initial_step(f, t0, y, k1, rtol, atol)
+        nfev += 1
+    h = min(h0, max_step)
+
+    t = t0
+    t_vals, y_vals, h_vals, Q_vals = [t0], [y.copy()], [], []
+    n_accepted = n_rejected = 0
+    err_prev = 1.0
+    rejected_last = False
+    status, message = 0, "Success"
+
+    while t < t_end:
+        if h < 10 * np.spacing(t):
+            status, message = -1, f"Required step size is less than spacing between numbers at t = {t}."
+            break
+        if t + h > t_end:
+            h = t_end - t
+
+        y_new, y_err = dopri5_step(f, t, y, h, k1, K)
+        nfev += 6
+        err = error_norm(y_err, y, y_new, rtol, atol)
+
+        if err <= 1.0:
+            # PI controller: react to the current error and damp with the previous one
+            if err == 0:
+                factor = MAX_FACTOR
+            else:
+                factor = SAFETY * err ** -PI_ALPHA * err_prev ** PI_BETA
+                factor = min(MAX_FACTOR, max(MIN_FACTOR, factor))
+            if rejected_last:
+                factor = min(1.0, factor)
+            err_prev = max(err, 1e-4)
+
+            if dense_output or t_eval is not None:
+                Q_vals.append(K.T @ P)
+                h_vals.append(h)
+            t = t + h
+            y = y_new
+            k1 = K[6].copy()  # FSAL: the last stage is the next step's first
+            t_vals.append(t)
+            y_vals.append(y)
+            n_accepted += 1
+            rejected_last = False
+            h = min(h * factor, max_step)
+        else:
+            # reject: shrink using the current error only, k1 is still valid
+            h *= max(MIN_FACTOR, SAFETY * err ** -(1/5))
+            n_rejected += 1
+            rejected_last = True
+
+    t_vals = np.array(t_vals)
+    y_vals = np.array(y_vals)
+    sol = None
+    if dense_output or t_eval is not None:
+        sol = DenseOutput(t_vals, y_vals, np.array(h_vals), np.array(Q_vals))
+    if t_eval is not None:
+        t_vals = np.asarray(t_eval, dtype=float)
+        t_vals = t_vals[t_vals <= t]  # only the part that was integrated
+        y_vals = sol(t_vals).T if len(h_vals) else np.empty((0, y.size))
+    return DopriResult(t_vals, y_vals, sol if dense_output else None, nfev, n_accepted, n_rejected,
+                       status, message)
+
+
+if __name__ == "__main__":
+    import time
+
+    from scipy.integrate import solve_ivp
+
+    from problems import PROBLEMS, scalar_rhs
+
+    print("Adaptive Dormand–Prince (FSAL + PI + dense output) vs solve_ivp")
+    print("Error = max |y - y_ref| on 2000 dense-output samples, reference DOP853 at rtol=atol=1e-12\n")
+    header = f"{'problem':<15} {'rtol':>7} {'solver':<12} {'steps':>6} {'rej.%':>6} {'nfev':>7} {'nfev/step':>9} {'error':>10} {'time ms':>8}"
+    print(header)
+    print("-" * len(header))
+
+    for name, problem in PROBLEMS.items():
+        f = scalar_rhs(problem["rhs"], *problem["params"].values())
+        t_span, y0 = problem["t_span"], problem["y0"]
+        ref = solve_ivp(f, t_span, y0, method="DOP853", rtol=1e-12, atol=1e-12, dense_output=True)
+        samples = np.linspace(*t_span, 2000)
+        y_ref = ref.sol(samples)
+
+        for rtol in (1e-4, 1e-6, 1e-8):
+            atol = rtol * 1e-3
+            start = time.perf_counter()
+            ours = dopri5_solver(f, t_span, y0, rtol=rtol, atol=atol, dense_output=True)
+            ours_ms = (time.perf_counter() - start) * 1000
+            rate = 100 * ours.rejection_rate
+            err = np.max(np.abs(ours.sol(samples) - y_ref))
+            print(f"{name:<15} {rtol:>7.0e} {'dopri5':<12} {ours.n_accepted:>6} {rate:>6.1f} {ours.nfev:>7} "
+                  f"{ours.nfev_per_step:>9.2f} {err:>10.2e} {ours_ms:>8.1f}")
+
+            for method in ("RK45", "DOP853"):
+                start = time.perf_counter()
+                theirs = solve_ivp(f, t_span, y0, method=method, rtol=rtol, atol=atol, dense_output=True)
+                theirs_ms = (time.perf_counter() - start) * 1000
+                steps = len(theirs.t) - 1
+                err = np.max(np.abs(theirs.sol(samples) - y_ref))
+                print(f"{'':<15} {'':>7} {method:<12} {steps:>6} {'':>6} {theirs.nfev:>7} "
+                      f"{theirs.nfev / steps:>9.2f} {err:>10.2e} {theirs_ms:>8.1f}")
+        print()
@@ -0,0 +1,86 @@
+import numpy as np
+
+###############################################################################
+# Batched right-hand sides for the test problems in RK4_and_RK5_ODE.ipynb.
+#
+# Every function has the signature f(t, Y, out, *params):
+#   Y    array of shape (batch, dim), one row per trajectory
+#   out  preallocated array of the same shape that receives dY/dt
+#   params  scalars, or arrays of shape (batch,) for one value per trajectory
+###############################################################################
+
+def vanderpol(t, Y, out, mu):
+    """
+    Van der Pol oscillator.
+        y1' = y2
+        y2' = mu*(1 - y1^2)*y2 - y1
+    """
+    y1, y2 = Y[:, 0], Y[:, 1]
+    out[:, 0] = y2
+    out[:, 1] = mu * (1 - y1 * y1) * y2 - y1
+    return out
+
+def vanderpol_jacobian(t, Y, mu):
+    """ Jacobian of `vanderpol` for a single state Y of shape (2,) """
+    y1, y2 = Y
+    return np.array([[0.0, 1.0],
+                     [-2.0 * mu * y1 * y2 - 1.0, mu * (1 - y1 * y1)]])
+
+def lotka_volterra(t, Y, out, a, b, c, d):
+    """
+    Lotka–Volterra predator–prey system.
+        x' = a*x - b*x*y
+        y' = c*x*y - d*y
+    """
+    x, y = Y[:, 0], Y[:, 1]
+    xy = x * y
+    out[:, 0] = a * x - b * xy
+    out[:, 1] = c * xy - d * y
+    return out
+
+def brusselator(t, Y, out, A, B):
+    """
+    Brusselator.
+        x' = A - (B+1)*x + x^2*y
+        y' = B*x - x^2*y
+    """
+    x, y = Y[:, 0], Y[:, 1]
+    x2y = x * x * y
+    out[:, 0] = A - (B + 1) * x + x2y
+    out[:, 1] = B * x - x2y
+    return out
+
+def scalar_rhs(f, *params):
+    """
+    Wrap a batched RHS as the usual f(t, y) -> dy/dt for a single state,
+    e.g. for scipy.integrate.solve_ivp.
+    """
+    def rhs(t, y):
+        out = np.empty((1, len(y)))
+        f(t, np.asarray(y, dtype=float).reshape(1, -1), out, *params)
+        return out[0]
+    return rhs
+
+
+# The problem setups used in the notebook: RHS, parameters, interval and initial condition.
+PROBLEMS = {
+    "vanderpol": {
+        "rhs": vanderpol,
+        "jacobian": vanderpol_jacobian,
+        "params": {"mu": 10.0},
+        "t_span": (0.0, 10.0),
+        "y0": [2.0, 0.0],
+    },
+    "lotka_volterra": {
+        "rhs": lotka_volterra,
+        "params": {"a": 1.0, "b": 0.1, "c": 0.075, "d": 1.0},
+        "t_span": (0.0, 30.0),
+        "y0": [10.0, 5.0],
+    },
+    "brusselator": {
+        "rhs": brusselator,
+        "params": {"A": 1.0, "B": 3.0},
+        "t_span": (0.0, 10.0),
+        "y0": [1.0, 1.0],
+    },
+}
@@ -0,0 +1,230 @@
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+
+###############################################################################
+# Stiff integration mode: adaptive ROS2 Rosenbrock–W method.
+#
+# The explicit RK4/RK5 solvers in RK4_and_RK5_ODE.ipynb need h ~ 1/mu to stay
+# stable on Van der Pol, so their step count grows linearly with mu even where
+# the solution barely changes. ROS2
+# (Verwer et al., 1999) is L-stable and linearly implicit: each step solves
+# two linear systems with the same matrix W = I - gamma*h*J and needs no
+# Newton iteration.
+#
+#   (I - gamma*h*J) k1 = f(t, y)
+#   (I - gamma*h*J) k2 = f(t + h, y + h*k1) - 2*k1
+#   y_new = y + 3/2*h*k1 + 1/2*h*k2,        gamma = 1 + 1/sqrt(2)
+#
+# ROS2 is a W-method: it stays second order for any matrix J, so the Jacobian
+# does not have to be exact or current. The solver exploits that:
+#   - J is reused for several steps and only refreshed after a rejection or
+#     when it gets old,
+#   - the LU factors of W are reused whenever h is unchanged, and h is held
+#     fixed when the controller would only change it slightly.
+# The embedded first-order solution y + h*k1 (linearly implicit Euler) gives
+# the error estimate y_new - (y + h*k1) = h/2*(k1 + k2).
+#
+# The RHS has the notebook signature f(t, y) -> dy/dt.
+###############################################################################
+
+GAMMA = 1 + 1 / np.sqrt(2)
+
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 5.0
+# keep h (and the LU factors) if the controller asks for a change inside this band
+HOLD_BAND = (1.0, 1.2)
+
+
+def fd_jacobian(f, t, y, fy):
+    """ Forward-difference Jacobian; costs len(y) RHS calls """
+    n = y.size
+    J = np.empty((n, n))
+    eps = np.sqrt(np.finfo(float).eps)
+    for j in range(n):
+        dy = eps * max(1.0, abs(y[j]))
+        y_pert = y.copy()
+        y_pert[j] += dy
+        J[:, j] = (f(t, y_pert) - fy) / dy
+    return J
+
+
+class StiffResult:
+    """ Solution and work statistics returned by `ros2_solver` """
+
+    def __init__(self, t, y, nfev, njev, nlu, n_accepted, n_rejected, status=0, message="Success"):
+        self.t = t
+        self.y = y
+        self.nfev = nfev
+        self.njev = njev
+        self.nlu = nlu
+        self.n_accepted = n_accepted
+        self.n_rejected = n_rejected
+        self.status = status      # 0: reached t_end, -1: integration step failed (as in solve_ivp)
+        self.message = message
+
+    @property
+    def success(self):
+        return self.status == 0
+
+    def __repr__(self):
+        return (f"StiffResult(status={self.status}, steps={self.n_accepted}, rejected={self.n_rejected}, "
+                f"nfev={self.nfev}, njev={self.njev}, nlu={self.nlu})")
+
+
+def ros2_solver(f, t_span, y0, rtol=1e-4, atol=1e-6, jac=None, h0=None, max_step=np.inf,
+                max_jac_age=20):
+    """
+    Solve a stiff system y' = f(t, y) with adaptive ROS2.
+
+    Args:
+        f: RHS f(t, y) -> dy/dt.
+        t_span: (t0, t_end) with t_end > t0.
+        y0: Initial state.
+        rtol, atol: Relative and absolute tolerances.
+        jac: Optional Jacobian jac(t, y) -> (dim, dim) array; finite differences
+            are used when None.
+        h0: Initial step; estimated from the RHS when None.
+        max_step: Upper bound on the step size.
+        max_jac_age: Accepted steps after which the Jacobian is refreshed even
+            if no step was rejected.
+
+    Returns:
+        StiffResult with t, y (shape (len(t), dim)), nfev, njev (Jacobian
+        evaluations), nlu (LU factorizations), n_accepted, n_rejected, status
+        and message. If the step size falls below 10 * np.spacing(t) (e.g. the
+        solution blows up), integration stops with status -1.
+    """
+    t0, t_end = t_span
+    y = np.array(y0, dtype=float)
+    n = y.size
+    identity = np.eye(n)
+
+    fy = f(t0, y)
+    nfev, njev, nlu = 1, 0, 0
+
+    def jacobian(t, y, fy):
+        nonlocal nfev, njev
+        njev += 1
+        if jac is not None:
+            return np.asarray(jac(t, y), dtype=float)
+        nfev += n
+        return fd_jacobian(f, t, y, fy)
+
+    if h0 is None:
+        scale = atol + rtol * np.abs(y)
+        d = np.sqrt(np.mean((fy / scale) ** 2))
+        h0 = 1e-6 if d < 1e-5 else 0.01 / d
+    h = min(h0, max_step, t_end - t0)
+
+    J = jacobian(t0, y, fy)
+    jac_age = 0
+    jac_fresh = True
+    lu, lu_h = None, None
+
+    t = t0
+    t_vals, y_vals = [t0], [y.copy()]
+    n_accepted = n_rejected = 0
+    status, message = 0, "Success"
+
+    while t < t_end:
+        if h < 10 * np.spacing(t):
+            status, message = -1, f"Required step size is less than spacing between numbers at t = {t}."
+            break
+        step_h = min(h, t_end - t)
+        if lu is None or step_h != lu_h:
+            # no finiteness checks: inf/NaN stages must reach the error test below and be rejected
+            lu = lu_factor(identity - GAMMA * step_h * J, check_finite=False)
+            lu_h = step_h
+            nlu += 1
+
+        k1 = lu_solve(lu, fy, check_finite=False)
+        f2 = f(t + step_h, y + step_h * k1)
+        k2 = lu_solve(lu, f2 - 2 * k1, check_finite=False)
+        nfev += 1
+        y_new = y + step_h * (1.5 * k1 + 0.5 * k2)
+
+        y_err = 0.5 * step_h * (k1 + k2)
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        err = np.sqrt(np.mean((y_err / scale) ** 2))
+        factor = MAX_FACTOR if err == 0 else min(MAX_FACTOR, max(MIN_FACTOR, SAFETY * err ** -0.5))
+
+        if err <= 1.0 and np.all(np.isfinite(y_new)):
+            t = t + step_h
+            y = y_new
+            fy = f(t, y)
+            nfev += 1
+            t_vals.append(t)
+            y_vals.append(y)
+            n_accepted += 1
+            jac_age += 1
+            jac_fresh = False
+
+            if jac_age >= max_jac_age:
+                J = jacobian(t, y, fy)
+                jac_age, jac_fresh, lu = 0, True, None
+            # small increases are not worth a new factorization
+            if HOLD_BAND[0] <= factor <= HOLD_BAND[1]:
+                factor = 1.0
+            h = min(step_h * factor, max_step)
+        else:
+            n_rejected += 1
+            h = step_h * (MIN_FACTOR if not np.isfinite(err) else min(factor, 1.0))
+            # a stale Jacobian is the usual culprit for a rejection in stiff regions
+            if not jac_fresh:
+                J = jacobian(t, y, fy)
+                jac_age, jac_fresh, lu = 0, True, None
+
+    return StiffResult(np.array(t_vals), np.array(y_vals), nfev, njev, nlu, n_accepted, n_rejected,
+                       status, message)
+
+
+if __name__ == "__main__":
+    import time
+
+    from scipy.integrate import solve_ivp
+
+    from dopri import dopri5_solver
+    from problems import scalar_rhs, vanderpol, vanderpol_jacobian
+    from rk_ensemble import rk4_ensemble
+
+    t_span, y0 = (0.0, 10.0), [2.0, 0.0]
+    rtol, atol = 1e-4, 1e-6
+
+    print("Van der Pol, t in [0, 10], y0 = [2, 0]; error is max |y(t_end) - y_ref(t_end)|")
+    print("Reference: scipy Radau at rtol=atol=1e-10\n")
+    header = f"{'mu':>6} {'solver':<28} {'steps':>9} {'nfev':>9} {'njev':>5} {'nLU':>5} {'error':>10} {'time s':>8}"
+    print(header)
+    print("-" * len(header))
+
+    for mu in (10.0, 100.0, 1000.0):
+        f = scalar_rhs(vanderpol, mu)
+        ref = solve_ivp(f, t_span, y0, method="Radau", rtol=1e-10, atol=1e-10)
+        y_ref = ref.y[:, -1]
+
+        for label, kwargs in (("ros2 (finite-diff J)", {}),
+                              ("ros2 (analytic J)", {"jac": lambda t, y: vanderpol_jacobian(t, y, mu)})):
+            start = time.perf_counter()
+            res = ros2_solver(f, t_span, y0, rtol=rtol, atol=atol, **kwargs)
+            elapsed = time.perf_counter() - start
+            err = np.max(np.abs(res.y[-1] - y_ref))
+            print(f"{mu:>6g} {label:<28} {res.n_accepted:>9} {res.nfev:>9} {res.njev:>5} {res.nlu:>5} "
+                  f"{err:>10.2e} {elapsed:>8.3f}")
+
+        start = time.perf_counter()
+        res = dopri5_solver(f, t_span, y0, rtol=rtol, atol=atol)
+        elapsed = time.perf_counter() - start
+        err = np.max(np.abs(res.y[-1] - y_ref))
+        print(f"{mu:>6g} {'dopri5 (explicit adaptive)':<28} {res.n_accepted:>9} {res.nfev:>9} {'':>5} {'':>5} "
+              f"{err:>10.2e} {elapsed:>8.3f}")
+
+        # fixed-step RK4 must keep h*|lambda| under ~2.8, and |lambda| ~ 3*mu near y1 = 2
+        h = min(0.0015625, 0.5 / mu)
+        start = time.perf_counter()
+        t4, y4 = rk4_ensemble(vanderpol, t_span, y0, h, args=(mu,), save_every=None)
+        elapsed = time.perf_counter() - start
+        err = np.max(np.abs(y4[-1] - y_ref))
+        steps = int(np.ceil((t_span[1] - t_span[0]) / h))
+        print(f"{mu:>6g} {f'rk4 fixed h={h:.2g}':<28} {steps:>9} {4 * steps:>9} {'':>5} {'':>5} "
+              f"{err:>10.2e} {elapsed:>8.3f}")
+        print()
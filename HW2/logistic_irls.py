@@ -0,0 +1,219 @@
+import numpy as np
+
+###############################################################################
+# Newton / IRLS logistic regression without the m x m weight matrix.
+#
+# newton_method in HW2.ipynb forms R = np.diag(h*(1-h)) (m x m) and
+# H = X.T @ R @ X, and calls np.linalg.cond(H) on every iteration. Here the
+# Hessian is built by weighting the rows of X instead, one chunk of rows at a
+# time, so memory is O(chunk_size * n + n^2) no matter how many rows there are:
+#
+#     H = sum over chunks of  X_c.T @ (w_c[:, None] * X_c),   w = h*(1-h)
+#     g = sum over chunks of  X_c.T @ (y_c - h_c)
+#
+# The data can be in-memory arrays or any re-iterable source of (X, y) chunks,
+# e.g. a generator over a memory-mapped file, for data that does not fit in
+# memory. The step is solved with a Cholesky factorization; when H is
+# singular or badly conditioned (collinear features, separable data) a ridge
+# term is added and increased until the factorization is trustworthy, instead
+# of failing like the notebook's "Singular matrix error!" branch.
+###############################################################################
+
+DEFAULT_CHUNK_SIZE = 65536
+# Hessians whose Cholesky-estimated condition number exceeds this are regularized
+CONDITION_LIMIT = 1e12
+
+
+def sigmoid(z):
+    """ Logistic function, written with tanh so large |z| cannot overflow """
+    return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+def array_chunks(X, y, chunk_size=DEFAULT_CHUNK_SIZE):
+    """ Return a re-iterable source of (X, y) row chunks over in-memory arrays """
+    def source():
+        for start in range(0, len(X), chunk_size):
+            yield X[start:start + chunk_size], y[start:start + chunk_size]
+    return source
+
+
+def gradient_and_hessian(theta, source, l2=0.0):
+    """
+    One pass over the data.
+
+    Returns:
+        gradient: X.T @ (y - h) - l2*theta
+        H: X.T @ diag(h*(1-h)) @ X + l2*I, built by row weighting
+        n_rows: Number of rows seen
+    """
+    n = theta.size
+    gradient = np.zeros(n)
+    H = np.zeros((n, n))
+    n_rows = 0
+    for X_c, y_c in source():
+        X_c = np.asarray(X_c, dtype=float)
+        h = sigmoid(X_c @ theta)
+        gradient += X_c.T @ (np.asarray(y_c, dtype=float) - h)
+        H += X_c.T @ (X_c * (h * (1 - h))[:, None])
+        n_rows += len(X_c)
+    if l2:
+        gradient -= l2 * theta
+        H[np.diag_indices(n)] += l2
+    return gradient, H, n_rows
+
+
+def _cholesky_condition(L):
+    """ Cheap condition estimate of L @ L.T from the diagonal of its Cholesky factor """
+    d = np.abs(np.diag(L))
+    return (d.max() / d.min()) ** 2 if d.min() > 0 else np.inf
+
+
+def regularized_solve(H, gradient, condition_limit=CONDITION_LIMIT, max_tries=20):
+    """
+    Solve H @ delta = gradient for a symmetric positive semi-definite H.
+    If H is singular or its condition estimate exceeds `condition_limit`,
+    retry with H + ridge*I, growing ridge tenfold each time.
+
+    Returns:
+        delta, ridge (0.0 when no regularization was needed)
+    """
+    n = len(H)
+    ridge = 0.0
+    base = max(np.trace(H) / n, 1.0) * 1e-10
+    for _ in range(max_tries):
+        try:
+            L = np.linalg.cholesky(H + ridge * np.eye(n) if ridge else H)
+        except np.linalg.LinAlgError:
+            L = None
+        if L is not None and _cholesky_condition(L) <= condition_limit:
+            z = np.linalg.solve(L, gradient)
+            return np.linalg.solve(L.T, z), ridge
+        ridge = base if ridge == 0.0 else ridge * 10
+    raise np.linalg.LinAlgError("Hessian stayed singular after regularization.")
+
+
+def _irls(source, n_features, tol, max_iter, l2, check_condition, verbose):
+    theta = np.zeros(n_features)  # initialize guess at 0
+    info = {"iterations": 0, "converged": False, "ridge": [], "condition_numbers": []}
+
+    for i in range(max_iter):
+        gradient, H, _ = gradient_and_hessian(theta, source, l2)
+
+        if check_condition:
+            condition_number = np.linalg.cond(H)
+            info["condition_numbers"].append(condition_number)
+            if verbose:
+                print(f"Hessian condition number for {i+1}th iterations:", condition_number)
+
+        delta_theta, ridge = regularized_solve(H, gradient)
+        info["ridge"].append(ridge)
+        if verbose and ridge:
+            print(f"Iteration {i+1}: Hessian is singular, added ridge {ridge:.3g}.")
+        theta += delta_theta
+        info["iterations"] = i + 1
+
+        # check convergence
+        if np.linalg.norm(delta_theta) < tol:
+            info["converged"] = True
+            if verbose:
+                print(f"Converged in {i+1} iterations.")
+            return theta, info
+
+    if verbose:
+        print("Newton's method did not fully converge.")
+    return theta, info
+
+
+def newton_logistic(X, y, tol=1e-6, max_iter=20, l2=0.0, chunk_size=DEFAULT_CHUNK_SIZE,
+                    check_condition=False, verbose=False):
+    """
+    Fit logistic regression by Newton's method (IRLS) on in-memory arrays.
+
+    Args:
+        X: (m, n) feature matrix.
+        y: (m,) labels in {0, 1}.
+        tol: Stop when the Newton step norm drops below this.
+        max_iter: Maximum Newton iterations.
+        l2: Optional L2 penalty on theta.
+        chunk_size: Rows processed at once; bounds the temporary memory.
+        check_condition: Record np.linalg.cond(H) every iteration (an extra SVD of n x n).
+        verbose: Print progress like the notebook version.
+
+    Returns:
+        theta: (n,) estimated parameters.
+        info: dict with iterations, converged, ridge (per-iteration fallback
+            regularization, 0.0 when none was needed) and condition_numbers.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    return _irls(array_chunks(X, y, chunk_size), X.shape[1], tol, max_iter, l2, check_condition, verbose)
+
+
+def newton_logistic_streaming(source, n_features, tol=1e-6, max_iter=20, l2=0.0,
+                              check_condition=False, verbose=False):
+    """
+    Fit logistic regression from data that does not fit in memory.
+
+    Args:
+        source: Callable returning a fresh iterator of (X_chunk, y_chunk) pairs;
+            it is called once per Newton iteration. For example
+                lambda: ((X_mm[i:i+k], y_mm[i:i+k]) for i in range(0, m, k))
+            over np.load(..., mmap_mode="r") arrays.
+        n_features: Number of columns n.
+        Other arguments as in `newton_logistic`.
+
+    Returns:
+        theta, info as in `newton_logistic`.
+    """
+    return _irls(source, n_features, tol, max_iter, l2, check_condition, verbose)
+
+
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    def notebook_newton(X, y, tol=1e-6, max_iter=20):
+        """ newton_method from HW2.ipynb, without the prints """
+        theta = np.zeros(X.shape[1])
+        for i in range(max_iter):
+            h = sigmoid(X @ theta)
+            gradient = X.T @ (y - h)
+            R = np.diag(h * (1 - h))
+            H = X.T @ R @ X
+            np.linalg.cond(H)
+            delta_theta = np.linalg.solve(H, gradient)
+            theta += delta_theta
+            if np.linalg.norm(delta_theta) < tol:
+                return theta
+        return theta
+
+    def measure(fit, *args):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = fit(*args)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result, elapsed, peak / 2**20
+
+    np.random.seed(42)
+    true_theta = np.array([3, 5])
+    print(f"{'m':>8} {'solver':<18} {'time s':>8} {'peak MB':>9}  theta")
+    for m in (2000, 5000, 1_000_000):
+        X = np.random.rand(m, 2)
+        y = (np.random.rand(m) < sigmoid(X @ true_theta)).astype(int)
+        if m <= 5000:
+            theta, elapsed, peak = measure(notebook_newton, X, y)
+            print(f"{m:>8} {'notebook (diag R)':<18} {elapsed:>8.3f} {peak:>9.1f}  {theta}")
+        (theta, info), elapsed, peak = measure(newton_logistic, X, y)
+        print(f"{m:>8} {'row-weighted':<18} {elapsed:>8.3f} {peak:>9.1f}  {theta}")
+
+    # exactly collinear features make H singular (the notebook's 2*x + 1 variant
+    # is still full rank, since there is no intercept column)
+    m = 5000
+    X = np.random.rand(m, 1)
+    X = np.hstack([X, 2 * X])
+    y = (np.random.rand(m) < sigmoid(X @ true_theta)).astype(int)
+    theta, info = newton_logistic(X, y)
+    print(f"\nCollinear features: theta = {theta}, converged = {info['converged']}, "
+          f"max ridge = {max(info['ridge']):.3g}")
@@ -0,0 +1,249 @@
+from collections import deque
+
+import numpy as np
+from scipy.linalg import solve_triangular
+
+from qr import givens_qr
+
+###############################################################################
+# Least squares over a stream of rows by updating a QR factorization.
+#
+# Newton_method in HW2.ipynb solves (X^T X) beta = X^T y from scratch, which
+# needs all rows at once and squares the condition number of X. Here only the
+# triangular factor of the rows seen so far is kept, augmented with the
+# transformed right-hand side:
+#
+#     Q^T [X | y] = [[R, z], [0, e]],   beta = R^{-1} z,   rss = ||e||^2
+#
+#   - appending a row: n Givens rotations (as in the notebook's givens_qr)
+#     rotate [x | y] into [R | z], O(n^2) per row; a block of rows is folded
+#     in with the tree-paired Givens QR from qr.py, O(k n^2) for k rows;
+#   - removing a row: the LINPACK dchdd downdate, with each rotation applied
+#     to all columns of R at once, O(n^2) per row;
+#   - with `window` set, the oldest rows are downdated automatically, giving a
+#     sliding-window fit. Only the rows inside the window are buffered (they
+#     are needed for the downdate); nothing is ever refactored. remove() on a
+#     windowed fit also drops the row from that buffer, so it is not downdated
+#     again when it would have left the window.
+###############################################################################
+
+
+class StreamingLeastSquares:
+    """
+    Incrementally updated least-squares fit of y ~ X @ beta.
+
+    Args:
+        n_features: Number of columns n of X.
+        window: Keep only the most recent `window` rows (None keeps all).
+    """
+
+    def __init__(self, n_features, window=None):
+        if window is not None and window < n_features:
+            raise ValueError("window must hold at least n_features rows")
+        self.n_features = n_features
+        self.window = window
+        # [R | z], R upper triangular with a nonnegative diagonal
+        self.Rz = np.zeros((n_features, n_features + 1))
+        self._rss = 0.0
+        self.n_rows = 0
+        self._buffer = deque() if window is not None else None
+
+    @property
+    def R(self):
+        return self.Rz[:, :-1]
+
+    @property
+    def rss(self):
+        """ Residual sum of squares of the current fit """
+        return self._rss
+
+    def add(self, X, y):
+        """ Append one row (x of shape (n,), scalar y) or a block (X (k, n), y (k,)) """
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if X.ndim == 1:
+            X, y = X[None, :], y.reshape(1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"expected {self.n_features} features, got {X.shape[1]}")
+
+        rows = np.column_stack([X, y])
+        if len(rows) == 1:
+            self._rotate_in(rows[0].copy())
+        else:
+            self._fold_in(rows)
+        self.n_rows += len(rows)
+
+        if self._buffer is not None:
+            self._buffer.extend(rows)
+            while len(self._buffer) > self.window:
+                self._downdate(self._buffer.popleft())
+
+    def remove(self, X, y):
+        """
+        Downdate one row or a block of rows that were previously added.
+
+        With `window` set, each removed row is also deleted from the window
+        buffer (the oldest identical row), so it is not downdated a second time
+        when it would have aged out. Rows that are not in the window raise
+        ValueError and leave the fit unchanged.
+        """
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if X.ndim == 1:
+            X, y = X[None, :], y.reshape(1)
+        rows = np.column_stack([X, y])
+
+        if self._buffer is not None:
+            # locate every row first so a missing one does not leave a half-applied removal
+            buffered = list(self._buffer)
+            positions = set()
+            for row in rows:
+                match = next((i for i, kept in enumerate(buffered)
+                              if i not in positions and np.array_equal(kept, row)), None)
+                if match is None:
+                    raise ValueError("Row to remove is not in the current window.")
+                positions.add(match)
+            self._buffer = deque(kept for i, kept in enumerate(buffered) if i not in positions)
+
+        for row in rows:
+            self._downdate(row)
+
+    def _rotate_in(self, row):
+        """ Givens-rotate one augmented row [x | y] into [R | z] """
+        Rz = self.Rz
+        for i in range(self.n_features):
+            a, b = Rz[i, i], row[i]
+            if b == 0.0:
+                continue
+            r = np.hypot(a, b)
+            c, s = a / r, b / r
+            top = c * Rz[i, i:] + s * row[i:]
+            row[i:] = -s * Rz[i, i:] + c * row[i:]
+            Rz[i, i:] = top
+        self._rss += row[-1] ** 2
+
+    def _fold_in(self, rows):
+        """ Triangularize [[R, z], [0, sqrt(rss)], rows] with tree-paired Givens """
+        n = self.n_features
+        stacked = np.zeros((n + 1 + len(rows), n + 1))
+        stacked[:n] = self.Rz
+        stacked[n, n] = np.sqrt(self._rss)
+        stacked[n + 1:] = rows
+        R = givens_qr(stacked, mode="r")
+        self.Rz = R[:n]
+        self._rss = R[n, n] ** 2
+
+    def _downdate(self, row):
+        """
+        Remove one augmented row [x | y] (LINPACK dchdd).
+
+        Solves R^T a = x, builds the n rotations that zero a against
+        sqrt(1 - ||a||^2), and applies rotation i to row i of R for every
+        column at once. z and the residual are updated alongside.
+        """
+        n = self.n_features
+        R, z = self.Rz[:, :-1], self.Rz[:, -1]
+        x, zeta = row[:-1], row[-1]
+
+        a = solve_triangular(R, x, trans="T")
+        norm = np.dot(a, a)
+        if not norm < 1.0:
+            raise np.linalg.LinAlgError("Downdate would leave a rank-deficient factor.")
+        alpha = np.sqrt(1.0 - norm)
+
+        c = np.empty(n)
+        s = np.empty(n)
+        for i in range(n - 1, -1, -1):
+            scale = alpha + abs(a[i])
+            p, q = alpha / scale, a[i] / scale
+            r = np.hypot(p, q)
+            c[i], s[i] = p / r, q / r
+            alpha = scale * r
+
+        # column j is rotated by i = j, j-1, ..., 0; xx carries the fill-in per column
+        xx = np.zeros(n)
+        for i in range(n - 1, -1, -1):
+            Ri, xi = R[i, i:], xx[i:]
+            t = c[i] * xi + s[i] * Ri
+            Ri *= c[i]
+            Ri -= s[i] * xi
+            xx[i:] = t
+
+        for i in range(n):
+            z[i] = (z[i] - s[i] * zeta) / c[i]
+            zeta = c[i] * zeta - s[i] * z[i]
+        self._rss = max(self._rss - zeta ** 2, 0.0)
+        self.n_rows -= 1
+
+    def coef(self):
+        """ Current estimate beta = R^{-1} z by back substitution """
+        diagonal = np.abs(np.diag(self.R))
+        if self.n_rows < self.n_features or diagonal.min() <= 1e-14 * max(diagonal.max(), 1.0):
+            raise np.linalg.LinAlgError("Need n_features linearly independent rows for a unique fit.")
+        return solve_triangular(self.R, self.Rz[:, -1])
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    n = 20
+    true_beta = rng.standard_normal(n)
+
+    def make_rows(k):
+        X = rng.standard_normal((k, n))
+        return X, X @ true_beta + 0.1 * rng.standard_normal(k)
+
+    # 1) row-by-row stream vs re-solving the normal equations after every row
+    m = 20_000
+    X, y = make_rows(m)
+    model = StreamingLeastSquares(n)
+    start = time.perf_counter()
+    for i in range(m):
+        model.add(X[i], y[i])
+    per_row = (time.perf_counter() - start) / m
+
+    start = time.perf_counter()
+    for i in range(m - 200, m):
+        np.linalg.solve(X[:i + 1].T @ X[:i + 1], X[:i + 1].T @ y[:i + 1])
+    resolve = (time.perf_counter() - start) / 200
+
+    print(f"Stream of {m} rows, n = {n}")
+    print(f"  Givens row update:                 {per_row * 1e6:8.1f} us/row (independent of rows seen)")
+    print(f"  normal equations from scratch:     {resolve * 1e6:8.1f} us/row at {m} rows (grows with m)")
+    print(f"  max |beta - lstsq| = {np.max(np.abs(model.coef() - np.linalg.lstsq(X, y, rcond=None)[0])):.1e}, "
+          f"rss error = {abs(model.rss - np.sum((X @ model.coef() - y) ** 2)):.1e}")
+
+    # 2) block appends
+    model = StreamingLeastSquares(n)
+    start = time.perf_counter()
+    for i in range(0, m, 1000):
+        model.add(X[i:i + 1000], y[i:i + 1000])
+    print(f"  1000-row blocks:                   {(time.perf_counter() - start) / m * 1e6:8.1f} us/row, "
+          f"max |beta - lstsq| = {np.max(np.abs(model.coef() - np.linalg.lstsq(X, y, rcond=None)[0])):.1e}")
+
+    # 3) sliding window with downdating
+    window = 500
+    model = StreamingLeastSquares(n, window=window)
+    start = time.perf_counter()
+    worst = 0.0
+    for i in range(5000):
+        model.add(X[i], y[i])
+        if i >= window and i % 250 == 0:
+            ref = np.linalg.lstsq(X[i + 1 - window:i + 1], y[i + 1 - window:i + 1], rcond=None)[0]
+            worst = max(worst, np.max(np.abs(model.coef() - ref)))
+    print(f"\nSliding window of {window} rows over 5000 rows: {(time.perf_counter() - start) / 5000 * 1e6:.1f} us/row, "
+          f"max |beta - lstsq(window)| = {worst:.1e}")
+
+    # 4) ill-conditioned columns: normal equations square the condition number
+    t = np.linspace(0, 1, 2000)
+    V = np.vander(t, 12, increasing=True)
+    beta = np.ones(12)
+    target = V @ beta
+    model = StreamingLeastSquares(12)
+    for i in range(0, len(t), 100):
+        model.add(V[i:i + 100], target[i:i + 100])
+    normal = np.linalg.solve(V.T @ V, V.T @ target)
+    print(f"\nVandermonde 2000 x 12 (cond ~ {np.linalg.cond(V):.0e}), exact beta = 1:")
+    print(f"  streaming QR error:      {np.max(np.abs(model.coef() - beta)):.1e}")
+    print(f"  normal equations error:  {np.max(np.abs(normal - beta)):.1e}")
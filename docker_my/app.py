@@ -1,7 +1,12 @@
-from flask import Flask, render_template, request
+from flask import Flask, jsonify, render_template, request
+import numpy as np
+
+from expression import ExpressionError, evaluate, evaluate_many
 
 app = Flask(__name__)
 
+OPERATIONS = ("add", "subtract", "multiply", "divide")
+
 @app.route("/", methods=["GET", "POST"])
 def calculator():
     result = None
@@ -29,5 +34,121 @@ def calculator():
 
     return render_template("calculator.html", result=result, error=error)
 
+
+def compute_batch(num1, num2, operations):
+    """
+    Evaluate element-wise operations on two operand arrays in one vectorized pass.
+
+    Returns:
+        results: float array, NaN where the element failed.
+        errors: list with an error message per failed element and None elsewhere.
+    """
+    results = np.full(num1.shape, np.nan)
+    valid_inputs = np.isfinite(num1) & np.isfinite(num2)
+    for operation in OPERATIONS:
+        mask = operations == operation
+        if not mask.any():
+            continue
+        a, b = num1[mask], num2[mask]
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            if operation == "add":
+                results[mask] = a + b
+            elif operation == "subtract":
+                results[mask] = a - b
+            elif operation == "multiply":
+                results[mask] = a * b
+            elif operation == "divide":
+                results[mask] = np.where(b == 0, np.nan, a / b)
+
+    # later assignments win, so each element reports its most basic problem
+    errors = np.full(num1.shape, None, dtype=object)
+    errors[~np.isfinite(results)] = "Error: Result is too large."
+    errors[(operations == "divide") & (num2 == 0)] = "Error: Division by zero is not allowed."
+    errors[~valid_inputs] = "Error: Operands must be finite numbers."
+    errors[~np.isin(operations, OPERATIONS)] = "Error: Unknown operation."
+    results[errors.astype(bool)] = np.nan  # None -> False, message -> True
+    return results, errors.tolist()
+
+
+@app.route("/api/batch", methods=["POST"])
+def batch():
+    """
+    Evaluate many operations in one request.
+
+    Request JSON:
+        {"num1": [1, 2, ...], "num2": [3, 4, ...], "operation": "add"}
+    or one operation per element:
+        {"num1": [...], "num2": [...], "operations": ["add", "divide", ...]}
+
+    Response JSON:
+        {"results": [4.0, null, ...], "errors": [null, "Error: ...", ...]}
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify(error="Error: Request body must be a JSON object."), 400
+
+    try:
+        num1 = np.asarray(payload["num1"], dtype=float)
+        num2 = np.asarray(payload["num2"], dtype=float)
+    except KeyError as e:
+        return jsonify(error=f"Error: Missing field {e}."), 400
+    except (TypeError, ValueError):
+        return jsonify(error="Error: num1 and num2 must be arrays of numbers."), 400
+
+    if num1.ndim != 1 or num1.shape != num2.shape:
+        return jsonify(error="Error: num1 and num2 must be flat arrays of the same length."), 400
+
+    if "operations" in payload:
+        operations = np.asarray(payload["operations"], dtype=str)
+        if operations.shape != num1.shape:
+            return jsonify(error="Error: operations must have the same length as num1."), 400
+    else:
+        operations = np.full(num1.shape, str(payload.get("operation", "")))
+
+    results, errors = compute_batch(num1, num2, operations)
+    # NaN and Infinity are not valid JSON, failed elements are reported as null
+    values = results.astype(object)
+    values[np.isnan(results)] = None
+    return jsonify(results=values.tolist(), errors=errors)
+
+
+@app.route("/api/expression", methods=["POST"])
+def expression():
+    """
+    Evaluate an arithmetic expression such as "(a+b)*c/2".
+
+    Request JSON:
+        {"expression": "(a+b)*c/2", "variables": {"a": 1, "b": 2, "c": 4}}
+    or for many bindings at once (columns or a list of objects):
+        {"expression": "...", "bindings": {"a": [1, 2], "b": [3, 4], "c": [5, 6]}}
+    Add "precision": 50 to compute with 50 significant decimal digits; results
+    are then returned as strings so no digits are lost.
+
+    Response JSON:
+        {"result": 6.0} or {"results": [...], "errors": [...]}
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict) or not isinstance(payload.get("expression"), str):
+        return jsonify(error="Error: Request must be a JSON object with an 'expression' string."), 400
+
+    precision = payload.get("precision")
+    # bool is a subclass of int, so true would otherwise mean precision=1
+    if precision is not None and (not isinstance(precision, int) or isinstance(precision, bool)
+                                  or not 1 <= precision <= 1000):
+        return jsonify(error="Error: precision must be an integer between 1 and 1000."), 400
+
+    try:
+        if "bindings" in payload:
+            results, errors = evaluate_many(payload["expression"], payload["bindings"], precision)
+            if precision is not None:
+                results = [None if value is None else str(value) for value in results]
+            return jsonify(results=results, errors=errors)
+
+        result = evaluate(payload["expression"], payload.get("variables"), precision)
+    except ExpressionError as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(result=str(result) if precision is not None else result)
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=8080)
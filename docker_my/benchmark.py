@@ -0,0 +1,96 @@
+"""
+Throughput benchmark for the calculator's /api/batch endpoint.
+
+Against a running server, e.g. the gunicorn container built from this directory
+(`docker compose up -d --build`, or `docker build -t calculator .` and
+`docker run -p 8000:8080 calculator`), which listens on port 8000:
+    python benchmark.py --url http://localhost:8000 --batch-size 1000 --requests 200 --concurrency 8
+
+Without a server, through Flask's test client in this process:
+    python benchmark.py --in-process
+"""
+import argparse
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+OPERATIONS = ["add", "subtract", "multiply", "divide"]
+
+
+def make_payload(batch_size, seed=0):
+    """ Random operands and operations, with a few zero divisors mixed in """
+    rng = np.random.default_rng(seed)
+    num2 = rng.integers(-100, 100, batch_size)
+    return {
+        "num1": rng.integers(-1000, 1000, batch_size).tolist(),
+        "num2": num2.tolist(),
+        "operations": rng.choice(OPERATIONS, batch_size).tolist(),
+    }
+
+
+def http_sender(url):
+    """ Return a function that POSTs a JSON body to the batch endpoint """
+    endpoint = url.rstrip("/") + "/api/batch"
+
+    def send(body):
+        req = urllib.request.Request(endpoint, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req) as response:
+            return json.loads(response.read())
+
+    return send
+
+
+def in_process_sender():
+    """ Return a function that POSTs through Flask's test client """
+    from app import app
+
+    client = app.test_client()
+
+    def send(body):
+        return client.post("/api/batch", data=body, content_type="application/json").get_json()
+
+    return send
+
+
+def run(send, batch_size, n_requests, concurrency):
+    """ Send `n_requests` batches with `concurrency` threads and return latencies and wall time """
+    body = json.dumps(make_payload(batch_size)).encode("utf-8")
+    send(body)  # warm up
+
+    def timed(_):
+        started = time.perf_counter()
+        result = send(body)
+        assert len(result["results"]) == batch_size
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(timed, range(n_requests)))
+    return np.asarray(latencies), time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the /api/batch endpoint")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--in-process", action="store_true", help="use Flask's test client instead of HTTP")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    send = in_process_sender() if args.in_process else http_sender(args.url)
+    latencies, wall = run(send, args.batch_size, args.requests, args.concurrency)
+
+    operations = args.batch_size * args.requests
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    print(f"{args.requests} requests x {args.batch_size} operations, concurrency {args.concurrency}")
+    print(f"Wall time: {wall:.2f} s")
+    print(f"Throughput: {args.requests / wall:.1f} requests/s, {operations / wall:,.0f} operations/s")
+    print(f"Latency: p50 {p50:.1f} ms, p95 {p95:.1f} ms, p99 {p99:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
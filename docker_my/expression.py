@@ -0,0 +1,245 @@
+"""
+Safe arithmetic expressions for the calculator, e.g. "(a+b)*c/2".
+
+Expressions are parsed with `ast` into a restricted tree (numbers, variables,
++ - * / // % **, unary +/- and abs()) and compiled once into nested closures.
+Compiled expressions are kept in an LRU cache keyed by the expression text, so
+evaluating the same expression with new variable values skips parsing.
+Nothing is ever passed to `eval`.
+"""
+import ast
+import decimal
+import operator
+from functools import lru_cache
+
+import numpy as np
+
+MAX_EXPRESSION_LENGTH = 1000
+MAX_EXPONENT = 1000  # keeps inputs like 9**9**9 from tying up a worker
+MAX_DECIMAL_EXPONENT = 10000  # Decimal results beyond 1E+10000 are reported as overflow
+NESTING_ERROR = "Error: Expression is too deeply nested."
+CACHE_SIZE = 1024
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+FUNCTIONS = {
+    "abs": abs,
+}
+
+
+class ExpressionError(ValueError):
+    """ Raised for expressions that cannot be parsed, compiled or evaluated """
+
+
+def _checked_pow(base, exponent):
+    """ Power with a bound on the exponent """
+    # NumPy's max() cannot reduce a Decimal, so only arrays go through it
+    largest = abs(exponent) if isinstance(exponent, decimal.Decimal) else np.max(np.abs(exponent))
+    if largest > MAX_EXPONENT:
+        raise ExpressionError(f"Error: Exponent is larger than {MAX_EXPONENT}.")
+    result = operator.pow(base, exponent)
+    if isinstance(result, complex):  # e.g. (-8) ** 0.5 with Python floats
+        raise ExpressionError("Error: Result is not a real number.")
+    return result
+
+
+def _compile_node(node, use_decimal, names):
+    """ Turn one AST node into a closure env -> value, collecting variable names """
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        if use_decimal:
+            value = decimal.Decimal(str(node.value))
+        else:
+            # floats throughout, so integer literals cannot grow into huge Python ints
+            try:
+                value = float(node.value)
+            except OverflowError:
+                raise ExpressionError("Error: Number is too large.") from None
+        return lambda env: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        names.add(name)
+
+        def lookup(env):
+            try:
+                return env[name]
+            except KeyError:
+                raise ExpressionError(f"Error: Missing value for variable '{name}'.") from None
+        return lookup
+
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        left = _compile_node(node.left, use_decimal, names)
+        right = _compile_node(node.right, use_decimal, names)
+        op = _checked_pow if isinstance(node.op, ast.Pow) else BINARY_OPERATORS[type(node.op)]
+        return lambda env: op(left(env), right(env))
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        operand = _compile_node(node.operand, use_decimal, names)
+        op = UNARY_OPERATORS[type(node.op)]
+        return lambda env: op(operand(env))
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) \
+            and node.func.id in FUNCTIONS and len(node.args) == 1 and not node.keywords:
+        argument = _compile_node(node.args[0], use_decimal, names)
+        function = FUNCTIONS[node.func.id]
+        return lambda env: function(argument(env))
+
+    raise ExpressionError(f"Error: Unsupported syntax: {type(node).__name__}.")
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(text, use_decimal=False):
+    """
+    Parse and compile an expression. Results are cached per (text, use_decimal).
+
+    Returns:
+        tuple: (function, variables) where function(env) evaluates the expression
+            for a mapping of variable names to values, and variables is the
+            sorted tuple of names it uses.
+    """
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"Error: Expression is longer than {MAX_EXPRESSION_LENGTH} characters.")
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+        names = set()
+        function = _compile_node(tree.body, use_decimal, names)
+    except SyntaxError:
+        raise ExpressionError("Error: Invalid expression.") from None
+    except RecursionError:  # e.g. "-" * 999 + "1", which is within the length limit
+        raise ExpressionError(NESTING_ERROR) from None
+    return function, tuple(sorted(names))
+
+
+def _to_decimal(value):
+    """ Convert a binding to Decimal without going through binary floats """
+    try:
+        number = decimal.Decimal(str(value))
+    except decimal.InvalidOperation:
+        number = None
+    if number is None or not number.is_finite():  # Decimal accepts "NaN" and "Infinity"
+        raise ExpressionError(f"Error: Invalid number: {value!r}")
+    return number
+
+
+def evaluate(text, variables=None, precision=None):
+    """
+    Evaluate an expression once.
+
+    Args:
+        text: The expression, e.g. "(a+b)*c/2".
+        variables: Mapping of variable names to numbers.
+        precision: Significant digits for arbitrary-precision Decimal arithmetic;
+            None evaluates with floats.
+    """
+    variables = {} if variables is None else variables
+    if not isinstance(variables, dict):
+        raise ExpressionError("Error: variables must be an object mapping names to numbers.")
+    use_decimal = precision is not None
+    function, _ = compile_expression(text, use_decimal)
+    try:
+        if use_decimal:
+            with decimal.localcontext() as context:
+                context.prec = precision
+                context.Emax = MAX_DECIMAL_EXPONENT
+                context.Emin = -MAX_DECIMAL_EXPONENT
+                result = function({name: _to_decimal(value) for name, value in variables.items()})
+        else:
+            result = function({name: float(value) for name, value in variables.items()})
+    except ExpressionError:
+        raise
+    except RecursionError:
+        raise ExpressionError(NESTING_ERROR) from None
+    except ZeroDivisionError:  # includes decimal.DivisionByZero
+        raise ExpressionError("Error: Division by zero is not allowed.") from None
+    except (OverflowError, decimal.Overflow):
+        raise ExpressionError("Error: Result is too large.") from None
+    except decimal.InvalidOperation:  # e.g. (-2)**0.5 or Infinity * 0
+        raise ExpressionError("Error: Result is undefined.") from None
+    except (TypeError, ValueError, ArithmeticError) as e:
+        raise ExpressionError(f"Error: {e}") from None
+    finite = result.is_finite() if use_decimal else np.isfinite(result)
+    if not finite:  # e.g. 1e308 * 10
+        raise ExpressionError("Error: Result is too large.")
+    return result
+
+
+BINDINGS_ERROR = "Error: bindings must be an object of value lists or a list of objects."
+
+
+def evaluate_many(text, bindings, precision=None):
+    """
+    Evaluate an expression for many variable bindings.
+
+    Args:
+        bindings: Either a list of {name: value} dicts or a {name: [values]} dict
+            of equal-length columns.
+        precision: As in `evaluate`. With floats the whole batch is computed in one
+            vectorized NumPy pass; with Decimals each binding is evaluated in turn.
+
+    Returns:
+        tuple: (results, errors) lists, with None in `results` and a message in
+            `errors` wherever an element failed.
+    """
+    if isinstance(bindings, dict):
+        if not all(isinstance(values, list) for values in bindings.values()):
+            raise ExpressionError(BINDINGS_ERROR)
+        columns = bindings
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ExpressionError("Error: All variable columns must have the same length.")
+        size = lengths.pop() if lengths else 0
+    elif isinstance(bindings, list) and all(isinstance(row, dict) for row in bindings):
+        _, names = compile_expression(text, precision is not None)
+        size = len(bindings)
+        columns = {name: [row.get(name) for row in bindings] for name in names}
+        for name, values in columns.items():
+            if any(value is None for value in values):
+                raise ExpressionError(f"Error: Missing value for variable '{name}'.")
+    else:
+        raise ExpressionError(BINDINGS_ERROR)
+
+    if precision is not None:
+        results, errors = [], []
+        for i in range(size):
+            try:
+                results.append(evaluate(text, {name: values[i] for name, values in columns.items()}, precision))
+                errors.append(None)
+            except ExpressionError as e:
+                results.append(None)
+                errors.append(str(e))
+        return results, errors
+
+    function, _ = compile_expression(text, False)
+    try:
+        env = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+    except (TypeError, ValueError):
+        raise ExpressionError("Error: Variable values must be numbers.") from None
+    try:
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            values = np.broadcast_to(np.asarray(function(env), dtype=float), (size,))
+    except ExpressionError:
+        raise
+    except RecursionError:
+        raise ExpressionError(NESTING_ERROR) from None
+    except (ZeroDivisionError, OverflowError, ValueError, TypeError):
+        # raised by Python float arithmetic on constant parts, e.g. "a + 1/0" or
+        # "a + 10**400"; the failure applies to every element
+        values = np.full(size, np.nan)
+
+    failed = ~np.isfinite(values)
+    results = np.where(failed, None, values).tolist()
+    errors = np.where(failed, "Error: Result is undefined (division by zero or overflow).", None).tolist()
+    return results, errors
@@ -0,0 +1,15 @@
+# Gunicorn settings for serving the calculator in the container.
+# Override the worker count with WEB_CONCURRENCY, e.g. `docker run -e WEB_CONCURRENCY=8 ...`
+import multiprocessing
+import os
+
+bind = "0.0.0.0:8080"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# a few threads per worker keep slow clients from blocking a whole process
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+# recycle workers now and then to bound memory growth
+max_requests = 10000
+max_requests_jitter = 1000
+timeout = 30
+accesslog = "-"
@@ -0,0 +1,186 @@
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Keyword -> (function name, arguments) used to decide which tool the fake model calls.
+# The first keyword found in the latest user message wins.
+FUNCTION_RULES = [
+    ("describe", "describe_data", {}),
+    ("heatmap", "plot_covariance_heatmap", {}),
+    ("covariance", "plot_covariance_heatmap", {}),
+    ("boxplot", "plot_feature_boxplots", {}),
+    ("advice", "get_dataframe_advice", {"n": 5, "max_cols": 5}),
+    ("columns", "list_columns", {}),
+    ("s3", "load_s3_csv_from_aws", {}),
+    ("sample.csv", "analyze_csv", {"file_path": "sample.csv"}),
+    ("weather", "get_weather", {"location": "London"}),
+]
+
+CANNED_REPLY = "This is a canned reply from the local fake OpenAI server used for load testing."
+
+
+class FakeOpenAIConfig:
+    """ Latency settings shared by all request handlers """
+
+    def __init__(self, latency=0.5, jitter=0.1, token_delay=0.02):
+        self.latency = latency
+        self.jitter = jitter
+        self.token_delay = token_delay
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def sleep(self):
+        """ Simulate model latency: `latency` seconds plus up to `jitter` either way """
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        time.sleep(max(delay, 0))
+
+
+def choose_function(body):
+    """ Return (name, arguments) for the tool the fake model should call, or None """
+    functions = {f["name"] for f in body.get("functions") or []}
+    messages = body.get("messages") or []
+    # after a tool has run the model answers in plain text
+    if not functions or not messages or messages[-1].get("role") == "function":
+        return None
+    text = (messages[-1].get("content") or "").lower()
+    for keyword, name, arguments in FUNCTION_RULES:
+        if keyword in text and name in functions:
+            return name, arguments
+    return None
+
+
+def completion_response(body):
+    """ Build a non-streaming chat.completion payload """
+    call = choose_function(body)
+    if call is None:
+        message = {"role": "assistant", "content": CANNED_REPLY}
+        finish_reason = "stop"
+    else:
+        name, arguments = call
+        message = {
+            "role": "assistant",
+            "content": None,
+            "function_call": {"name": name, "arguments": json.dumps(arguments)},
+        }
+        finish_reason = "function_call"
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake-model"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def stream_chunks(body):
+    """ Yield chat.completion.chunk payloads for a streamed text reply """
+    base = {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body.get("model", "fake-model"),
+    }
+    yield {**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]}
+    for word in CANNED_REPLY.split(" "):
+        yield {**base, "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}]}
+    yield {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+
+
+def make_handler(config):
+    """ Bind a request handler class to `config` """
+
+    class FakeOpenAIHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass  # keep the load test output readable
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            with config.lock:
+                config.requests += 1
+
+            config.sleep()
+            if body.get("stream"):
+                self._send_stream(body)
+            else:
+                self._send_json(200, completion_response(body))
+
+        def _send_json(self, status, payload):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_stream(self, body):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in stream_chunks(body):
+                self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+                time.sleep(config.token_delay)
+            self._write_chunk("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _write_chunk(self, text):
+            data = text.encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+    return FakeOpenAIHandler
+
+
+class QuietThreadingHTTPServer(ThreadingHTTPServer):
+    """ ThreadingHTTPServer that ignores clients hanging up on kept-alive connections """
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+def start_fake_openai(host="127.0.0.1", port=0, latency=0.5, jitter=0.1, token_delay=0.02):
+    """
+    Start the fake OpenAI server in a background thread.
+
+    Returns:
+        tuple: (server, config) — `server.server_address` holds the bound port,
+            `config.requests` counts handled completions, `server.shutdown()` stops it.
+    """
+    config = FakeOpenAIConfig(latency=latency, jitter=jitter, token_delay=token_delay)
+    server = QuietThreadingHTTPServer((host, port), make_handler(config))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, config
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI chat completions API")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--latency", type=float, default=0.5, help="mean seconds per completion")
+    parser.add_argument("--jitter", type=float, default=0.1, help="uniform +/- seconds around the mean")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds between streamed chunks")
+    args = parser.parse_args()
+
+    server, _ = start_fake_openai(port=args.port, latency=args.latency,
+                                  jitter=args.jitter, token_delay=args.token_delay)
+    print(f"Fake OpenAI listening on http://127.0.0.1:{server.server_address[1]}/v1")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
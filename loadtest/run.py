@@ -0,0 +1,361 @@
+"""
+Concurrent load test for the Gradio apps in AI_API/ and Api_cliff/.
+
+The real app is started as a subprocess with its OpenAI traffic pointed at a
+local fake server (fake_openai.py) and its S3 traffic pointed at a moto
+server, then N virtual users run scripted sessions against it through
+gradio_client. The report gives p50/p95/p99 latency per stage, throughput
+and the app's peak memory.
+
+    python loadtest/run.py --app ai_api --users 20 --sessions 3
+    python loadtest/run.py --app api_cliff --users 50 --openai-latency 1.0
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+
+import numpy as np
+
+from fake_openai import start_fake_openai
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PORT = 7860  # both apps hard-code this port
+S3_BUCKET = "loadtest-bucket"
+AWS_REGION = "us-east-1"
+
+# Scripted sessions: (stage name, message). "UPLOAD" sends the generated CSV.
+SESSIONS = {
+    "ai_api": [
+        ("upload", "UPLOAD"),
+        ("describe", "Please describe the data"),
+        ("plot", "Plot the covariance heatmap"),
+        ("advice", "Give me advice on what to do with this data"),
+        ("chat", "Hello, what can you do?"),
+    ],
+    "api_cliff": [
+        ("chat", "Hello, what can you do?"),
+        ("describe", "Please load the CSV from sample.csv"),
+        ("weather", "What is the weather in London?"),
+        ("chat", "Thanks, that is all."),
+    ],
+}
+
+# Endpoint names differ between Gradio versions ("/predict" in 4.x, the function name later)
+APPS = {
+    "ai_api": {"directory": "AI_API", "api_names": ["/chatbot_ui", "/predict"]},
+    "api_cliff": {"directory": "Api_cliff", "api_names": ["/send_message"]},
+}
+
+# Both apps report failures as ordinary reply text rather than raising, so a
+# reply starting with one of these is counted as an error
+APP_ERROR_PREFIXES = (
+    "Error",  # "Error: ...", "Error loading file from S3: ...", "Error uploading file: ..."
+    "Please load the data file first!",
+    "No data loaded.",
+    "AWS credentials not found.",
+)
+
+
+def write_csv(path, rows, cols, seed=0):
+    """ Write a numeric CSV used by the upload stage """
+    rng = np.random.default_rng(seed)
+    data = rng.normal(size=(rows, cols))
+    header = ",".join(f"feature_{i}" for i in range(cols))
+    np.savetxt(path, data, delimiter=",", header=header, comments="", fmt="%.6f")
+
+
+def start_moto():
+    """ Start a moto S3 server and create the bucket the app uploads to """
+    import boto3
+    from moto.server import ThreadedMotoServer
+
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    endpoint = f"http://{host}:{port}"
+    boto3.client(
+        "s3", endpoint_url=endpoint, region_name=AWS_REGION,
+        aws_access_key_id="testing", aws_secret_access_key="testing",
+    ).create_bucket(Bucket=S3_BUCKET)
+    return server, endpoint
+
+
+def start_app(app, python, openai_url, s3_endpoint, log_file):
+    """ Launch the app with its OpenAI and S3 clients pointed at the local stand-ins """
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_API_KEY": "sk-loadtest",
+        "OPENAI_BASE_URL": openai_url,  # openai>=1.0
+        "OPENAI_API_BASE": openai_url,  # openai==0.28 (Api_cliff)
+        "AWS_ACCESS_KEY_ID": "testing",
+        "AWS_SECRET_ACCESS_KEY": "testing",
+        "AWS_REGION": AWS_REGION,
+        "AWS_ENDPOINT_URL": s3_endpoint,
+        "S3_BUCKET_NAME": S3_BUCKET,
+        "MPLBACKEND": "Agg",
+    })
+    directory = os.path.join(REPO_ROOT, APPS[app]["directory"])
+    # load_dotenv() in the apps does not override variables that are already set
+    return subprocess.Popen([python, "app.py"], cwd=directory, env=env,
+                            stdout=log_file, stderr=subprocess.STDOUT)
+
+
+def wait_for_app(process, timeout):
+    """ Poll the app's HTTP port until it answers """
+    url = f"http://127.0.0.1:{APP_PORT}/"
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited with code {process.returncode} before it was ready")
+        try:
+            with urllib.request.urlopen(url, timeout=2):
+                return
+        except OSError:
+            time.sleep(0.5)
+    raise TimeoutError(f"App did not answer on {url} within {timeout} seconds")
+
+
+class MemorySampler(threading.Thread):
+    """ Track the peak resident memory of a process while the test runs """
+
+    def __init__(self, pid, interval=0.2):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak_bytes = 0
+        self.running = True
+
+    def _rss(self):
+        try:
+            import psutil
+            return psutil.Process(self.pid).memory_info().rss
+        except ImportError:
+            pass
+        try:
+            with open(f"/proc/{self.pid}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return 0
+
+    def _high_water_mark(self):
+        """ Kernel-tracked peak RSS on Linux, which also catches spikes between samples """
+        try:
+            with open(f"/proc/{self.pid}/status") as status:
+                for line in status:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return 0
+
+    def run(self):
+        while self.running:
+            self.peak_bytes = max(self.peak_bytes, self._rss(), self._high_water_mark())
+            time.sleep(self.interval)
+
+    def stop(self):
+        self.running = False
+        self.peak_bytes = max(self.peak_bytes, self._high_water_mark())
+
+
+def resolve_api_name(client, candidates):
+    """ Return the first candidate endpoint the running app actually exposes """
+    endpoints = client.view_api(print_info=False, return_format="dict")["named_endpoints"]
+    for name in candidates:
+        if name in endpoints:
+            return name
+    raise RuntimeError(f"None of {candidates} found; the app exposes {sorted(endpoints)}")
+
+
+def reply_error(app, result):
+    """ Return the app's error text if `result` reports a failure, else None """
+    if app == "ai_api":
+        # (response, plot, table); a streamed call returns the last update
+        reply = result[0] if isinstance(result, (list, tuple)) else result
+    else:
+        # (textbox, chatbot, state, chatbot); the reply is the last (user, assistant) pair
+        pairs = result[1] if isinstance(result, (list, tuple)) and len(result) > 1 else None
+        if not pairs:
+            return "no reply added to the chat history"
+        reply = pairs[-1][1]
+    if not isinstance(reply, str):
+        return None
+    if reply.strip().startswith(APP_ERROR_PREFIXES):
+        return reply
+    return None
+
+
+def virtual_user(user_id, app, csv_path, sessions, think_time, start_delay, results, lock):
+    """ Run `sessions` scripted sessions as one user and record (stage, seconds, ok) """
+    from gradio_client import Client, handle_file
+
+    time.sleep(start_delay)
+    started = time.perf_counter()
+    try:
+        client = Client(f"http://127.0.0.1:{APP_PORT}/", verbose=False)
+        api_name = resolve_api_name(client, APPS[app]["api_names"])
+    except Exception as e:
+        # without a client none of this user's requests can run
+        print(f"user {user_id} could not connect: {e}", file=sys.stderr)
+        with lock:
+            results.append(("connect", time.perf_counter() - started, False))
+        return
+
+    for _ in range(sessions):
+        for stage, message in SESSIONS[app]:
+            if app == "ai_api":
+                if message == "UPLOAD":
+                    args = ("\n", handle_file(csv_path), "")
+                else:
+                    args = (message, None, "")
+            else:
+                args = (message, "")
+
+            started = time.perf_counter()
+            try:
+                error = reply_error(app, client.predict(*args, api_name=api_name))
+            except Exception as e:
+                error = e
+            ok = error is None
+            if not ok:
+                print(f"user {user_id} stage {stage} failed: {error}", file=sys.stderr)
+            elapsed = time.perf_counter() - started
+
+            with lock:
+                results.append((stage, elapsed, ok))
+            if think_time:
+                time.sleep(think_time)
+
+
+def summarize(results, wall_seconds, peak_bytes, fake_openai_requests):
+    """ Build the report dictionary from the raw (stage, seconds, ok) samples """
+    by_stage = defaultdict(list)
+    errors = defaultdict(int)
+    for stage, seconds, ok in results:
+        by_stage[stage].append(seconds)
+        if not ok:
+            errors[stage] += 1
+
+    stages = {}
+    for stage, samples in by_stage.items():
+        samples = np.asarray(samples)
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        stages[stage] = {
+            "requests": int(len(samples)),
+            "errors": errors[stage],
+            "mean_s": float(samples.mean()),
+            "p50_s": float(p50),
+            "p95_s": float(p95),
+            "p99_s": float(p99),
+            "max_s": float(samples.max()),
+            "throughput_rps": len(samples) / wall_seconds,
+        }
+
+    return {
+        "wall_seconds": wall_seconds,
+        "requests": len(results),
+        "errors": sum(errors.values()),
+        "throughput_rps": len(results) / wall_seconds if wall_seconds else 0.0,
+        "peak_memory_mb": peak_bytes / 2**20,
+        "fake_openai_requests": fake_openai_requests,
+        "stages": stages,
+    }
+
+
+def print_report(report, args):
+    """ Print the report as a table """
+    print(f"\nLoad test: app={args.app} users={args.users} sessions/user={args.sessions} "
+          f"openai latency={args.openai_latency}s")
+    print("-" * 86)
+    print(f"{'stage':<10} {'reqs':>6} {'errs':>5} {'p50 (s)':>9} {'p95 (s)':>9} "
+          f"{'p99 (s)':>9} {'max (s)':>9} {'req/s':>8}")
+    print("-" * 86)
+    for stage, row in report["stages"].items():
+        print(f"{stage:<10} {row['requests']:>6} {row['errors']:>5} {row['p50_s']:>9.3f} "
+              f"{row['p95_s']:>9.3f} {row['p99_s']:>9.3f} {row['max_s']:>9.3f} "
+              f"{row['throughput_rps']:>8.2f}")
+    print("-" * 86)
+    print(f"Total: {report['requests']} requests, {report['errors']} errors in "
+          f"{report['wall_seconds']:.1f}s -> {report['throughput_rps']:.2f} req/s")
+    print(f"Peak app memory: {report['peak_memory_mb']:.1f} MB")
+    print(f"Fake OpenAI completions served: {report['fake_openai_requests']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for the Gradio apps")
+    parser.add_argument("--app", choices=sorted(APPS), default="ai_api")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--sessions", type=int, default=1, help="scripted sessions per user")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="seconds over which users start")
+    parser.add_argument("--think-time", type=float, default=0.0, help="pause between a user's requests")
+    parser.add_argument("--openai-latency", type=float, default=0.5)
+    parser.add_argument("--openai-jitter", type=float, default=0.1)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--rows", type=int, default=10000, help="rows in the uploaded CSV")
+    parser.add_argument("--cols", type=int, default=10, help="columns in the uploaded CSV")
+    parser.add_argument("--python", default=sys.executable, help="interpreter that runs the app")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--json", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="loadtest_")
+    csv_path = os.path.join(workdir, "loadtest.csv")
+    write_csv(csv_path, args.rows, args.cols)
+
+    openai_server, openai_config = start_fake_openai(
+        latency=args.openai_latency, jitter=args.openai_jitter, token_delay=args.token_delay)
+    openai_url = f"http://127.0.0.1:{openai_server.server_address[1]}/v1"
+    moto_server, s3_endpoint = start_moto()
+
+    log_path = os.path.join(workdir, "app.log")
+    with open(log_path, "w") as log_file:
+        app_process = start_app(args.app, args.python, openai_url, s3_endpoint, log_file)
+        try:
+            wait_for_app(app_process, args.startup_timeout)
+            sampler = MemorySampler(app_process.pid)
+            sampler.start()
+
+            results = []
+            lock = threading.Lock()
+            users = []
+            for user_id in range(args.users):
+                start_delay = args.ramp_up * user_id / max(args.users, 1)
+                users.append(threading.Thread(
+                    target=virtual_user,
+                    args=(user_id, args.app, csv_path, args.sessions, args.think_time,
+                          start_delay, results, lock),
+                ))
+
+            started = time.perf_counter()
+            for user in users:
+                user.start()
+            for user in users:
+                user.join()
+            wall_seconds = time.perf_counter() - started
+            sampler.stop()
+        finally:
+            app_process.terminate()
+            app_process.wait(timeout=30)
+            moto_server.stop()
+            openai_server.shutdown()
+
+    report = summarize(results, wall_seconds, sampler.peak_bytes, openai_config.requests)
+    print_report(report, args)
+    print(f"App log: {log_path}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()